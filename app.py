@@ -1,27 +1,31 @@
 import streamlit as st
 import swisseph as swe
 import datetime
-import math
-import json
 import os
-from geopy.geocoders import Nominatim
+
+from bharatheeyam import (
+    KN_DASHA_LEVELS, KN_NAK, KN_PLANETS, KN_RASHI, KN_VARGA, LORDS, PLANET_ORDER,
+    SHODASHAVARGA, ChartError, ProfileStore, bhava_indices, birth_jd, dasha_at,
+    fmt_deg, get_full_calculations_cached, load_gazetteer, maha_dashas,
+    shodashavarga, sub_periods, varga_indices, varga_longitude
+)
+from bharatheeyam.gazetteer import BUNDLED_PLACES
+
+try:
+    from geopy.geocoders import Nominatim
+except ImportError:
+    Nominatim = None
 
 # ==========================================
 # 1. DATABASE & FILE HANDLING
 # ==========================================
-DB_FILE = "kundli_db.json"
-
-def load_db():
-    if not os.path.exists(DB_FILE):
-        return {}
-    with open(DB_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+DB_FILE = "kundli_db.sqlite3"
+LEGACY_DB_FILE = "kundli_db.json"
+PROFILE_PAGE_SIZE = 20
 
-def save_db(name, data):
-    db = load_db()
-    db[name] = data
-    with open(DB_FILE, "w", encoding="utf-8") as f:
-        json.dump(db, f, ensure_ascii=False, indent=2)
+@st.cache_resource
+def get_store():
+    return ProfileStore(DB_FILE, legacy_json=LEGACY_DB_FILE)
 
 # ==========================================
 # 2. PAGE CONFIG & MULTI-COLOR THEME
@@ -237,459 +241,20 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==========================================
-# 3. CORE MATH ENGINE
+# 3. GEOCODER
 # ==========================================
-swe.set_ephe_path(None)
-geolocator = Nominatim(user_agent="bharatheeyam_v45_upagrahas_only")
-
-KN_PLANETS = {
-    0: "ರವಿ", 1: "ಚಂದ್ರ", 2: "ಬುಧ", 3: "ಶುಕ್ರ", 4: "ಕುಜ", 
-    5: "ಗುರು", 6: "ಶನಿ", 101: "ರಾಹು", 102: "ಕೇತು", 
-    "Ma": "ಮಾಂದಿ", "Lagna": "ಲಗ್ನ"
-}
-
-PLANET_ORDER = [
-    "ಲಗ್ನ", "ರವಿ", "ಚಂದ್ರ", "ಕುಜ", "ಬುಧ", 
-    "ಗುರು", "ಶುಕ್ರ", "ಶನಿ", "ರಾಹು", "ಕೇತು", "ಮಾಂದಿ"
-]
-
-KN_RASHI = [
-    "ಮೇಷ", "ವೃಷಭ", "ಮಿಥುನ", "ಕರ್ಕ", "ಸಿಂಹ", "ಕನ್ಯಾ", 
-    "ತುಲಾ", "ವೃಶ್ಚಿಕ", "ಧನು", "ಮಕರ", "ಕುಂಭ", "ಮೀನ"
-]
+# Extra GeoNames dumps / CSVs, separated by os.pathsep, on top of the bundled list
+GAZETTEER_ENV = "BHARATHEEYAM_GAZETTEER"
 
-KN_VARA = [
-    "ಭಾನುವಾರ", "ಸೋಮವಾರ", "ಮಂಗಳವಾರ", "ಬುಧವಾರ", 
-    "ಗುರುವಾರ", "ಶುಕ್ರವಾರ", "ಶನಿವಾರ"
-]
-KN_TITHI = [
-    "ಶುಕ್ಲ ಪಾಡ್ಯಮಿ", "ಶುಕ್ಲ ದ್ವಿತೀಯ", "ಶುಕ್ಲ ತೃತೀಯ", "ಶುಕ್ಲ ಚತುರ್ಥಿ",
-    "ಶುಕ್ಲ ಪಂಚಮಿ", "ಶುಕ್ಲ ಷಷ್ಠಿ", "ಶುಕ್ಲ ಸಪ್ತಮಿ", "ಶುಕ್ಲ ಅಷ್ಟಮಿ",
-    "ಶುಕ್ಲ ನವಮಿ", "ಶುಕ್ಲ ದಶಮಿ", "ಶುಕ್ಲ ಏಕಾದಶಿ", "ಶುಕ್ಲ ದ್ವಾದಶಿ",
-    "ಶುಕ್ಲ ತ್ರಯೋದಶಿ", "ಶುಕ್ಲ ಚತುರ್ದಶಿ", "ಹುಣ್ಣಿಮೆ", "ಕೃಷ್ಣ ಪಾಡ್ಯಮಿ",
-    "ಕೃಷ್ಣ ದ್ವಿತೀಯ", "ಕೃಷ್ಣ ತೃತೀಯ", "ಕೃಷ್ಣ ಚತುರ್ಥಿ", "ಕೃಷ್ಣ ಪಂಚಮಿ",
-    "ಕೃಷ್ಣ ಷಷ್ಠಿ", "ಕೃಷ್ಣ ಸಪ್ತಮಿ", "ಕೃಷ್ಣ ಅಷ್ಟಮಿ", "ಕೃಷ್ಣ ನವಮಿ",
-    "ಕೃಷ್ಣ ದಶಮಿ", "ಕೃಷ್ಣ ಏಕಾದಶಿ", "ಕೃಷ್ಣ ದ್ವಾದಶಿ", "ಕೃಷ್ಣ ತ್ರಯೋದಶಿ",
-    "ಕೃಷ್ಣ ಚತುರ್ದಶಿ", "ಅಮಾವಾಸ್ಯೆ"
-]
-KN_NAK = [
-    "ಅಶ್ವಿನಿ", "ಭರಣಿ", "ಕೃತಿಕಾ", "ರೋಹಿಣಿ", "ಮೃಗಶಿರ", "ಆರಿದ್ರಾ",
-    "ಪುನರ್ವಸು", "ಪುಷ್ಯ", "ಆಶ್ಲೇಷ", "ಮಘ", "ಪೂರ್ವ ಫಾಲ್ಗುಣಿ",
-    "ಉತ್ತರ ಫಾಲ್ಗುಣಿ", "ಹಸ್ತ", "ಚಿತ್ತಾ", "ಸ್ವಾತಿ", "ವಿಶಾಖ",
-    "ಅನುರಾಧ", "ಜ್ಯೇಷ್ಠ", "ಮೂಲ", "ಪೂರ್ವಾಷಾಢ", "ಉತ್ತರಾಷಾಢ",
-    "ಶ್ರವಣ", "ಧನಿಷ್ಠ", "ಶತಭಿಷ", "ಪೂರ್ವಾಭಾದ್ರ", "ಉತ್ತರಾಭಾದ್ರ",
-    "ರೇವತಿ"
-]
-KN_YOGA = [
-    "ವಿಷ್ಕಂಭ", "ಪ್ರೀತಿ", "ಆಯುಷ್ಮಾನ್", "ಸೌಭಾಗ್ಯ", "ಶೋಭನ",
-    "ಅತಿಗಂಡ", "ಸುಕರ್ಮ", "ಧೃತಿ", "ಶೂಲ", "ಗಂಡ",
-    "ವೃದ್ಧಿ", "ಧ್ರುವ", "ವ್ಯಾಘಾತ", "ಹರ್ಷಣ", "ವಜ್ರ",
-    "ಸಿದ್ಧಿ", "ವ್ಯತೀಪಾತ", "ವರೀಯಾನ್", "ಪರಿಘ", "ಶಿವ",
-    "ಸಿದ್ಧ", "ಸಾಧ್ಯ", "ಶುಭ", "ಶುಕ್ಲ", "ಬ್ರಹ್ಮ",
-    "ಇಂದ್ರ", "ವೈಧೃತಿ"
-]
-LORDS = ["ಕೇತು","ಶುಕ್ರ","ರವಿ","ಚಂದ್ರ","ಕುಜ","ರಾಹು","ಗುರು","ಶನಿ","ಬುಧ"]
-YEARS = [7, 20, 6, 10, 7, 18, 16, 19, 17]
+@st.cache_resource
+def get_gazetteer():
+    extra = [p for p in os.environ.get(GAZETTEER_ENV, "").split(os.pathsep) if p]
+    return load_gazetteer([BUNDLED_PLACES] + extra)
 
-def get_altitude_manual(jd, lat, lon):
-    try:
-        res = swe.calc_ut(jd, swe.SUN, swe.FLG_EQUATORIAL | swe.FLG_SWIEPH)
-        ra = res[0][0]
-        dec = res[0][1]
-        gmst = swe.sidtime(jd)
-        lst = gmst + (lon / 15.0)
-        ha_deg = ((lst * 15.0) - ra + 360) % 360
-        if ha_deg > 180: 
-            ha_deg -= 360
-            
-        lat_rad = math.radians(lat)
-        dec_rad = math.radians(dec)
-        ha_rad = math.radians(ha_deg)
-        
-        p1 = math.sin(lat_rad) * math.sin(dec_rad)
-        p2 = math.cos(lat_rad) * math.cos(dec_rad) * math.cos(ha_rad)
-        sin_alt = p1 + p2
-        
-        return math.degrees(math.asin(sin_alt))
-    except Exception:
-        return 0
-
-def find_sunrise_set_for_date(year, month, day, lat, lon):
-    jd_start = swe.julday(year, month, day, 0.0) 
-    rise_time, set_time = jd_start + 0.25, jd_start + 0.75 # Safe defaults
-    step = 1/24.0
-    current = jd_start - 0.3 
-    
-    try:
-        # Using -0.583 for Mid-Limb Sunrise (center of sun including refraction)
-        for i in range(30): 
-            alt1 = get_altitude_manual(current, lat, lon)
-            alt2 = get_altitude_manual(current + step, lat, lon)
-            if alt1 < -0.583 and alt2 >= -0.583:
-                l, h = current, current + step
-                for _ in range(20): 
-                    m = (l + h) / 2
-                    if get_altitude_manual(m, lat, lon) < -0.583: 
-                        l = m
-                    else: 
-                        h = m
-                rise_time = h
-            if alt1 > -0.583 and alt2 <= -0.583:
-                l, h = current, current + step
-                for _ in range(20): 
-                    m = (l + h) / 2
-                    if get_altitude_manual(m, lat, lon) > -0.583: 
-                        l = m
-                    else: 
-                        h = m
-                set_time = h
-            current += step
-    except Exception:
-        pass
-        
-    return rise_time, set_time
-
-def find_nak_limit(jd, target_deg):
-    low = jd - 1.2
-    high = jd + 1.2
-    try:
-        for _ in range(20):
-            mid = (low + high) / 2
-            ayan = swe.get_ayanamsa(mid)
-            m_deg = (swe.calc_ut(mid, swe.MOON)[0][0] - ayan) % 360
-            diff = (m_deg - target_deg + 180) % 360 - 180
-            if diff < 0: 
-                low = mid
-            else: 
-                high = mid
-        return mid
-    except Exception:
-        return jd
-
-def fmt_ghati(decimal_val):
-    g = int(decimal_val)
-    rem = decimal_val - g
-    v = int(round(rem * 60))
-    if v == 60: 
-        g += 1
-        v = 0
-    return str(g) + "." + str(v).zfill(2)
-
-def fmt_deg(dec_deg):
-    rem = dec_deg % 30
-    t_sec = int(round(rem * 3600))
-    dg = int(t_sec / 3600)
-    mn = int((t_sec % 3600) / 60)
-    sc = int(t_sec % 60)
-    if dg == 30:
-        dg = 29
-        mn = 59
-        sc = 59
-    s_dg = str(dg)
-    s_mn = str(mn).zfill(2)
-    s_sc = str(sc).zfill(2)
-    return s_dg + "° " + s_mn + "' " + s_sc + '"'
-
-def calculate_ashtakavarga(positions):
-    P_KEYS = ["ರವಿ", "ಚಂದ್ರ", "ಕುಜ", "ಬುಧ", "ಗುರು", "ಶುಕ್ರ", "ಶನಿ", "ಲಗ್ನ"]
-    r_idx = {k: int(positions[k] / 30) for k in P_KEYS}
-    
-    sav = [0] * 12
-    bav = {p: [0]*12 for p in ["ರವಿ", "ಚಂದ್ರ", "ಕುಜ", "ಬುಧ", "ಗುರು", "ಶುಕ್ರ", "ಶನಿ"]}
-    
-    BAV_RULES = {
-        "ರವಿ": [
-            [1,2,4,7,8,9,10,11], [3,6,10,11], [1,2,4,7,8,9,10,11], 
-            [3,5,6,9,10,11,12], [5,6,9,11], [6,7,12], 
-            [1,2,4,7,8,9,10,11], [3,4,6,10,11,12]
-        ],
-        "ಚಂದ್ರ": [
-            [3,6,7,8,10,11], [1,3,6,7,10,11], [2,3,5,6,9,10,11],
-            [1,3,4,5,7,8,10,11], [1,4,7,8,10,11,12], [3,4,5,7,9,10,11],
-            [3,5,6,11], [3,6,10,11]
-        ],
-        "ಕುಜ": [
-            [3,5,6,10,11], [3,6,11], [1,2,4,7,8,10,11],
-            [3,5,6,11], [6,10,11,12], [6,8,11,12],
-            [1,4,7,8,9,10,11], [1,3,6,10,11]
-        ],
-        "ಬುಧ": [
-            [5,6,9,11,12], [2,4,6,8,10,11], [1,2,4,7,8,9,10,11],
-            [1,3,5,6,9,10,11,12], [6,8,11,12], [1,2,3,4,5,8,9,11],
-            [1,2,4,7,8,9,10,11], [1,2,4,6,8,10,11]
-        ],
-        "ಗುರು": [
-            [1,2,3,4,7,8,9,10,11], [2,5,7,9,11], [1,2,4,7,8,10,11],
-            [1,2,4,5,6,9,10,11], [1,2,3,4,7,8,10,11], [2,5,6,9,10,11],
-            [3,5,6,12], [1,2,4,5,6,9,10,11]
-        ],
-        "ಶುಕ್ರ": [
-            [8,11,12], [1,2,3,4,5,8,9,11,12], [3,5,6,9,11,12],
-            [3,5,6,9,11], [5,8,9,10,11], [1,2,3,4,5,8,9,10,11],
-            [3,4,5,8,9,10,11], [1,2,3,4,5,8,9,11]
-        ],
-        "ಶನಿ": [
-            [1,2,4,7,8,10,11], [3,6,11], [3,5,6,10,11,12],
-            [6,8,9,10,11,12], [5,6,11,12], [6,11,12],
-            [3,5,6,11], [1,3,4,6,10,11]
-        ]
-    }
-    
-    for target in ["ರವಿ", "ಚಂದ್ರ", "ಕುಜ", "ಬುಧ", "ಗುರು", "ಶುಕ್ರ", "ಶನಿ"]:
-        rules = BAV_RULES[target]
-        for ref_idx, ref_planet in enumerate(P_KEYS):
-            ref_rashi = r_idx[ref_planet]
-            for h in rules[ref_idx]:
-                sign_idx = (ref_rashi + h - 1) % 12
-                bav[target][sign_idx] += 1
-                sav[sign_idx] += 1
-                
-    return sav, bav
+geolocator = Nominatim(user_agent="bharatheeyam_v45_upagrahas_only") if Nominatim else None
 
 # ==========================================
-# 4. MAIN CALCULATIONS & SPEED LOGIC
-# ==========================================
-def calculate_mandi(jd_birth, lat, lon, dob_obj):
-    y = dob_obj.year
-    m = dob_obj.month
-    d = dob_obj.day
-    sr_civil, ss_civil = find_sunrise_set_for_date(y, m, d, lat, lon)
-    
-    py_weekday = dob_obj.weekday()
-    civil_weekday_idx = (py_weekday + 1) % 7 
-    
-    is_night = False
-    if jd_birth >= sr_civil and jd_birth < ss_civil: 
-        is_night = False
-    else: 
-        is_night = True
-        
-    start_base = 0.0
-    duration = 0.0
-    vedic_wday = 0
-    panch_sr = 0.0
-    
-    if not is_night:
-        vedic_wday = civil_weekday_idx
-        panch_sr = sr_civil
-        start_base = sr_civil
-        duration = ss_civil - sr_civil
-    else:
-        if jd_birth < sr_civil:
-            vedic_wday = (civil_weekday_idx - 1) % 7
-            prev_d = dob_obj - datetime.timedelta(days=1)
-            p_y = prev_d.year
-            p_m = prev_d.month
-            p_d = prev_d.day
-            p_sr, p_ss = find_sunrise_set_for_date(p_y, p_m, p_d, lat, lon)
-            start_base = p_ss
-            duration = sr_civil - p_ss
-            panch_sr = p_sr
-        else:
-            vedic_wday = civil_weekday_idx
-            next_d = dob_obj + datetime.timedelta(days=1)
-            n_y = next_d.year
-            n_m = next_d.month
-            n_d = next_d.day
-            n_sr, n_ss = find_sunrise_set_for_date(n_y, n_m, n_d, lat, lon)
-            start_base = ss_civil
-            duration = n_sr - ss_civil
-            panch_sr = sr_civil
-
-    if not is_night: 
-        factors = [26, 22, 18, 14, 10, 6, 2] 
-    else: 
-        factors = [10, 6, 2, 26, 22, 18, 14] 
-        
-    factor = factors[vedic_wday]
-    mandi_jd = start_base + (duration * factor / 30.0)
-    
-    return mandi_jd, is_night, panch_sr, vedic_wday, start_base
-
-def get_full_calculations(jd_birth, lat, lon, dob_obj, ayan_mode, node_mode):
-    try:
-        swe.set_sid_mode(ayan_mode)
-        swe.set_topo(float(lon), float(lat), 0)
-        ayan = swe.get_ayanamsa(jd_birth)
-        positions = {}
-        speeds = {} 
-        extra_details = {}
-        
-        for pid in [0, 1, 2, 3, 4, 5, 6]:
-            flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
-            res = swe.calc_ut(jd_birth, pid, flag)
-            deg = res[0][0] % 360
-            speed = res[0][3]
-            
-            positions[KN_PLANETS[pid]] = deg
-            speeds[KN_PLANETS[pid]] = speed
-            
-            nak_idx = int(deg / 13.333333333)
-            pada = int((deg % 13.333333333) / 3.333333333) + 1
-            extra_details[KN_PLANETS[pid]] = {
-                "nak": KN_NAK[nak_idx % 27], 
-                "pada": pada
-            }
-
-        node_flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
-        rahu_res = swe.calc_ut(jd_birth, node_mode, node_flag)
-        rahu_deg = rahu_res[0][0] % 360
-        rahu_speed = rahu_res[0][3]
-        
-        positions[KN_PLANETS[101]] = rahu_deg
-        speeds[KN_PLANETS[101]] = rahu_speed
-        
-        positions[KN_PLANETS[102]] = (rahu_deg + 180) % 360
-        speeds[KN_PLANETS[102]] = rahu_speed
-        
-        nodes = [
-            (KN_PLANETS[101], rahu_deg), 
-            (KN_PLANETS[102], (rahu_deg + 180) % 360)
-        ]
-        
-        for p, d in nodes:
-            nak_idx = int(d / 13.333333333)
-            pada = int((d % 13.333333333) / 3.333333333) + 1
-            extra_details[p] = {"nak": KN_NAK[nak_idx % 27], "pada": pada}
-
-        houses_res = swe.houses(jd_birth, float(lat), float(lon), b'P')
-        cusps = houses_res[0]
-        
-        if len(cusps) == 13:
-            asc_deg = (cusps[1] - ayan) % 360
-            bhava_sphutas = [(cusps[i] - ayan) % 360 for i in range(1, 13)]
-        else:
-            asc_deg = (cusps[0] - ayan) % 360
-            bhava_sphutas = [(cusps[i] - ayan) % 360 for i in range(0, 12)]
-
-        positions[KN_PLANETS["Lagna"]] = asc_deg
-        speeds[KN_PLANETS["Lagna"]] = 0
-        nak_idx = int(asc_deg / 13.333333333)
-        pada = int((asc_deg % 13.333333333) / 3.333333333) + 1
-        extra_details[KN_PLANETS["Lagna"]] = {
-            "nak": KN_NAK[nak_idx % 27], 
-            "pada": pada
-        }
-
-        res = calculate_mandi(jd_birth, lat, lon, dob_obj)
-        mandi_time_jd = res[0]
-        is_night = res[1]
-        panch_sr = res[2]
-        w_idx = res[3]
-        debug_base = res[4]
-        
-        h_mandi = swe.houses(mandi_time_jd, float(lat), float(lon), b'P')
-        a_mandi = swe.get_ayanamsa(mandi_time_jd)
-        mandi_deg = (h_mandi[1][0] - a_mandi) % 360
-        positions[KN_PLANETS["Ma"]] = mandi_deg
-        speeds[KN_PLANETS["Ma"]] = 0
-        
-        nak_idx = int(mandi_deg / 13.333333333)
-        pada = int((mandi_deg % 13.333333333) / 3.333333333) + 1
-        extra_details[KN_PLANETS["Ma"]] = {
-            "nak": KN_NAK[nak_idx % 27], 
-            "pada": pada
-        }
-
-        m_deg = positions["ಚಂದ್ರ"]
-        s_deg = positions["ರವಿ"]
-        t_idx = int(((m_deg - s_deg + 360) % 360) / 12)
-        n_idx = int(m_deg / 13.333333333)
-        
-        y_deg = (m_deg + s_deg) % 360
-        y_idx = int(y_deg / 13.333333333)
-        yoga_name = KN_YOGA[y_idx]
-        
-        k_idx = int(((m_deg - s_deg + 360) % 360) / 6)
-        if k_idx == 0:
-            k_name = "ಕಿಂಸ್ತುಘ್ನ"
-        elif k_idx == 57:
-            k_name = "ಶಕುನಿ"
-        elif k_idx == 58:
-            k_name = "ಚತುಷ್ಪಾದ"
-        elif k_idx == 59:
-            k_name = "ನಾಗ"
-        else:
-            k_arr = ["ಬವ", "ಬಾಲವ", "ಕೌಲವ", "ತೈತಿಲ", "ಗರ", "ವಣಿಜ", "ಭದ್ರಾ (ವಿಷ್ಟಿ)"]
-            k_name = k_arr[(k_idx - 1) % 7]
-            
-        r_idx = int(m_deg / 30)
-        rasi_name = KN_RASHI[r_idx]
-        
-        js = find_nak_limit(jd_birth, n_idx * 13.333333333)
-        je = find_nak_limit(jd_birth, (n_idx + 1) * 13.333333333)
-        
-        perc = (m_deg % 13.333333333) / 13.333333333
-        bal = YEARS[n_idx % 9] * (1 - perc)
-        dt_birth = datetime.datetime.fromtimestamp((jd_birth - 2440587.5) * 86400)
-        
-        sav_bindus, bav_bindus = calculate_ashtakavarga(positions)
-        
-        # --- UPAGRAHAS & 16 ADVANCED SPHUTAS ---
-        S = positions["ರವಿ"]
-        M = positions["ಚಂದ್ರ"]
-        J = positions["ಗುರು"]
-        V = positions["ಶುಕ್ರ"]
-        Ma = positions["ಕುಜ"]
-        R = positions[KN_PLANETS[101]]
-        Asc = positions["ಲಗ್ನ"]
-        Md = positions["ಮಾಂದಿ"]
-        
-        dhooma = (S + 133.333333) % 360
-        vyatipata = (360 - dhooma) % 360
-        parivesha = (vyatipata + 180) % 360
-        indrachapa = (360 - parivesha) % 360
-        upaketu = (indrachapa + 16.666667) % 360
-        
-        bhrigu = (M + R) / 2
-        beeja = (S + V + J) % 360
-        kshetra = (M + Ma + J) % 360
-        yogi = (S + M + 93.333333) % 360
-        trisphuta = (Asc + M + Md) % 360
-        chatusphuta = (trisphuta + S) % 360
-        panchasphuta = (chatusphuta + R) % 360
-        prana = (Asc * 5 + Md) % 360
-        deha = (M * 8 + Md) % 360
-        mrityu = (Md * 7 + S) % 360
-        sookshma = (prana + deha + mrityu) % 360
-        
-        adv_sphutas = {
-            "ಧೂಮ": dhooma, "ವ್ಯತೀಪಾತ": vyatipata, "ಪರಿವೇಷ": parivesha,
-            "ಇಂದ್ರಚಾಪ": indrachapa, "ಉಪಕೇತು": upaketu, "ಭೃಗು ಬಿ.": bhrigu,
-            "ಬೀಜ": beeja, "ಕ್ಷೇತ್ರ": kshetra, "ಯೋಗಿ": yogi,
-            "ತ್ರಿಸ್ಫುಟ": trisphuta, "ಚತುಃಸ್ಫುಟ": chatusphuta,
-            "ಪಂಚಸ್ಫುಟ": panchasphuta, "ಪ್ರಾಣ": prana, "ದೇಹ": deha,
-            "ಮೃತ್ಯು": mrityu, "ಸೂಕ್ಷ್ಮ ತ್ರಿ.": sookshma
-        }
-        
-        pan = {
-            "t": KN_TITHI[min(t_idx, 29)], 
-            "v": KN_VARA[w_idx], 
-            "n": KN_NAK[n_idx % 27],
-            "y": yoga_name,
-            "k": k_name,
-            "r": rasi_name,
-            "sr": panch_sr, 
-            "udayadi": fmt_ghati((jd_birth - panch_sr) * 60), 
-            "gata": fmt_ghati((jd_birth - js) * 60), 
-            "parama": fmt_ghati((je - js) * 60), 
-            "rem": fmt_ghati((je - jd_birth) * 60),
-            "d_bal": str(int(bal)) + "ವ " + str(int((bal%1)*12)) + "ತಿ",
-            "n_idx": n_idx, 
-            "perc": perc, 
-            "date_obj": dt_birth,
-            "lord_bal": LORDS[n_idx%9],
-            "sav_bindus": sav_bindus,
-            "bav_bindus": bav_bindus,
-            "adv_sphutas": adv_sphutas
-        }
-        return positions, pan, extra_details, bhava_sphutas, speeds
-    except Exception as e:
-        st.error(f"ಲೆಕ್ಕಾಚಾರದಲ್ಲಿ ದೋಷ: {str(e)}")
-        return {}, {}, {}, [], {}
-
-# ==========================================
-# 5. DIALOG UI FOR PLANET POPUP
+# 4. DIALOG UI FOR PLANET POPUP
 # ==========================================
 @st.dialog("ಗ್ರಹದ ಸಂಪೂರ್ಣ ವಿವರ")
 def show_planet_popup(p_name, deg, speed, sun_deg):
@@ -719,55 +284,19 @@ def show_planet_popup(p_name, deg, speed, sun_deg):
         if p_name in ["ರವಿ", "ರಾಹು", "ಕೇತು", "ಲಗ್ನ", "ಮಾಂದಿ"]: 
             asta_text = "ಅನ್ವಯಿಸುವುದಿಲ್ಲ"
             
-        d1_idx = int(deg/30)
-        d1_name = KN_RASHI[d1_idx]
-        
-        r_val = int(deg/30)
-        dr_val = deg % 30
-        is_odd = (r_val % 2 == 0)
-        if is_odd: d2_idx = 4 if dr_val < 15 else 3
-        else: d2_idx = 3 if dr_val < 15 else 4
-        
-        if dr_val < 10: true_d3_idx = d1_idx
-        elif dr_val < 20: true_d3_idx = (d1_idx + 4) % 12
-        else: true_d3_idx = (d1_idx + 8) % 12
-        
-        if dr_val < 10: p1_part = " 1"
-        elif dr_val < 20: p1_part = " 2"
-        else: p1_part = " 3"
-        d3_d1_str = d1_name + p1_part
-        
-        d9_exact = (deg * 9) % 360
-        d9_idx = int(d9_exact / 30)
-        d9_name = KN_RASHI[d9_idx]
+        v_idx = dict(zip(SHODASHAVARGA, shodashavarga(deg).tolist()))
+        d1_idx = v_idx[1]
+        d9_idx = v_idx[9]
+        d12_idx = v_idx[12]
         
-        deg_in_d9 = d9_exact % 30
-        if deg_in_d9 < 10: p9_part = " 1"
-        elif deg_in_d9 < 20: p9_part = " 2"
-        else: p9_part = " 3"
-        d3_d9_str = d9_name + p9_part
+        def d3_part(x):
+            if x < 10: return " 1"
+            elif x < 20: return " 2"
+            return " 3"
         
-        d12_idx = (int(deg/30) + int((deg%30)/2.5)) % 12
-        d12_name = KN_RASHI[d12_idx]
-        
-        deg_in_d12 = (deg % 2.5) * 12
-        if deg_in_d12 < 10: p12_part = " 1"
-        elif deg_in_d12 < 20: p12_part = " 2"
-        else: p12_part = " 3"
-        d3_d12_str = d12_name + p12_part
-        
-        if is_odd:
-            if dr_val < 5: d30_idx = 0
-            elif dr_val < 10: d30_idx = 10
-            elif dr_val < 18: d30_idx = 8
-            elif dr_val < 25: d30_idx = 2
-            else: d30_idx = 6
-        else:
-            if dr_val < 5: d30_idx = 5
-            elif dr_val < 12: d30_idx = 2
-            elif dr_val < 20: d30_idx = 8
-            elif dr_val < 25: d30_idx = 10
-            else: d30_idx = 0
+        d3_d1_str = KN_RASHI[d1_idx] + d3_part(float(varga_longitude(deg, 1)))
+        d3_d9_str = KN_RASHI[d9_idx] + d3_part(float(varga_longitude(deg, 9)))
+        d3_d12_str = KN_RASHI[d12_idx] + d3_part(float(varga_longitude(deg, 12)))
             
         h_arr = []
         h_arr.append("<div class='card'><table class='key-val-table'>")
@@ -780,12 +309,8 @@ def show_planet_popup(p_name, deg, speed, sun_deg):
         st.markdown("#### 📊 ವರ್ಗಗಳು")
         v_arr = []
         v_arr.append("<div class='card'><table class='key-val-table'>")
-        v_arr.append("<tr><td class='key'>ರಾಶಿ</td><td>" + KN_RASHI[d1_idx] + "</td></tr>")
-        v_arr.append("<tr><td class='key'>ಹೋರಾ</td><td>" + KN_RASHI[d2_idx] + "</td></tr>")
-        v_arr.append("<tr><td class='key'>ದ್ರೇಕ್ಕಾಣ</td><td>" + KN_RASHI[true_d3_idx] + "</td></tr>")
-        v_arr.append("<tr><td class='key'>ನವಾಂಶ</td><td>" + KN_RASHI[d9_idx] + "</td></tr>")
-        v_arr.append("<tr><td class='key'>ದ್ವಾದಶಾಂಶ</td><td>" + KN_RASHI[d12_idx] + "</td></tr>")
-        v_arr.append("<tr><td class='key'>ತ್ರಿಂಶಾಂಶ</td><td>" + KN_RASHI[d30_idx] + "</td></tr>")
+        for v_n in SHODASHAVARGA:
+            v_arr.append("<tr><td class='key'>" + KN_VARGA[v_n] + "</td><td>" + KN_RASHI[v_idx[v_n]] + "</td></tr>")
         v_arr.append("</table></div>")
         st.markdown("".join(v_arr), unsafe_allow_html=True)
         
@@ -801,7 +326,7 @@ def show_planet_popup(p_name, deg, speed, sun_deg):
         st.error("ವಿವರಗಳನ್ನು ಲೋಡ್ ಮಾಡಲು ಸಾಧ್ಯವಾಗಲಿಲ್ಲ.")
 
 # ==========================================
-# 6. SESSION STATE & UI
+# 5. SESSION STATE & UI
 # ==========================================
 if 'page' not in st.session_state: 
     st.session_state.page = "input"
@@ -811,6 +336,10 @@ if 'notes' not in st.session_state:
     st.session_state.notes = ""
 if 'aroodhas' not in st.session_state: 
     st.session_state.aroodhas = {}
+if 'prof_cursors' not in st.session_state: 
+    st.session_state.prof_cursors = [None]
+if 'prof_last_q' not in st.session_state: 
+    st.session_state.prof_last_q = ""
     
 if 'name_input' not in st.session_state: 
     st.session_state.name_input = ""
@@ -845,18 +374,37 @@ st.markdown('<div class="header-box">ಭಾರತೀಯಮ್</div>', unsafe_all
 if st.session_state.page == "input":
     with st.container():
         
-        saved_db = load_db()
-        if len(saved_db) > 0:
+        store = get_store()
+        if not store.is_empty():
             st.markdown("<div class='card'>", unsafe_allow_html=True)
             st.markdown("#### 📂 ಉಳಿಸಿದ ಜಾತಕ")
+            prof_q = st.text_input("ಹೆಸರು / ಊರು ಹುಡುಕಿ", key="prof_q")
+            if st.session_state.prof_last_q != prof_q:
+                st.session_state.prof_last_q = prof_q
+                st.session_state.prof_cursors = [None]
+            
+            page = store.search(prof_q, mode="substring", limit=PROFILE_PAGE_SIZE,
+                                after=st.session_state.prof_cursors[-1])
+            page_rows = {r["name"]: r for r in page.rows}
+            
             c_sel, c_btn = st.columns([3, 1])
-            k_list = [""] + list(saved_db.keys())
+            k_list = [""] + list(page_rows.keys())
             
             sel_n = c_sel.selectbox("ಆಯ್ಕೆಮಾಡಿ", k_list, label_visibility="collapsed")
             
+            c_prev, c_next = st.columns(2)
+            if len(st.session_state.prof_cursors) > 1:
+                if c_prev.button("⬅️ ಹಿಂದಿನ", key="prof_prev", use_container_width=True):
+                    st.session_state.prof_cursors.pop()
+                    st.rerun()
+            if page.next_after is not None:
+                if c_next.button("ಮುಂದಿನ ➡️", key="prof_next", use_container_width=True):
+                    st.session_state.prof_cursors.append(page.next_after)
+                    st.rerun()
+            
             if c_btn.button("ತೆಗೆಯಿರಿ", use_container_width=True):
-                if sel_n != "":
-                    prof = saved_db[sel_n]
+                prof = page_rows.get(sel_n)
+                if prof:
                     st.session_state.name_input = sel_n
                     
                     try:
@@ -895,17 +443,25 @@ if st.session_state.page == "input":
         
         place_q = st.text_input("ಊರು ಹುಡುಕಿ", key="place_input")
         if st.button("ಹುಡುಕಿ"):
-            try:
-                # Added timeout to prevent geolocator crashes
-                loc = geolocator.geocode(place_q, timeout=10)
-                if loc: 
-                    st.session_state.lat = loc.latitude
-                    st.session_state.lon = loc.longitude
-                    st.success("📍 " + loc.address)
-                else:
-                    st.error("ಸ್ಥಳ ಕಂಡುಬಂದಿಲ್ಲ.")
-            except Exception: 
-                st.error("ಸ್ಥಳ ಸಂಪರ್ಕಿಸುವಲ್ಲಿ ದೋಷ. ದಯವಿಟ್ಟು ಅಕ್ಷಾಂಶ/ರೇಖಾಂಶವನ್ನು ನೇರವಾಗಿ ನಮೂದಿಸಿ.")
+            place = get_gazetteer().lookup(place_q)
+            if place:
+                st.session_state.lat = place.lat
+                st.session_state.lon = place.lon
+                st.success("📍 " + ", ".join(x for x in (place.name, place.admin1) if x))
+            elif geolocator is None:
+                st.error("ಸ್ಥಳ ಕಂಡುಬಂದಿಲ್ಲ.")
+            else:
+                try:
+                    # Added timeout to prevent geolocator crashes
+                    loc = geolocator.geocode(place_q, timeout=10)
+                    if loc: 
+                        st.session_state.lat = loc.latitude
+                        st.session_state.lon = loc.longitude
+                        st.success("📍 " + loc.address)
+                    else:
+                        st.error("ಸ್ಥಳ ಕಂಡುಬಂದಿಲ್ಲ.")
+                except Exception: 
+                    st.error("ಸ್ಥಳ ಸಂಪರ್ಕಿಸುವಲ್ಲಿ ದೋಷ. ದಯವಿಟ್ಟು ಅಕ್ಷಾಂಶ/ರೇಖಾಂಶವನ್ನು ನೇರವಾಗಿ ನಮೂದಿಸಿ.")
                 
         lat = st.number_input("ಅಕ್ಷಾಂಶ", key="lat", format="%.4f")
         lon = st.number_input("ರೇಖಾಂಶ", key="lon", format="%.4f")
@@ -923,7 +479,7 @@ if st.session_state.page == "input":
         if st.button("ಜಾತಕ ರಚಿಸಿ", type="primary"):
             h24 = h + (12 if ampm == "PM" and h != 12 else 0)
             h24 = 0 if ampm == "AM" and h == 12 else h24
-            jd = swe.julday(dob.year, dob.month, dob.day, h24 + m/60.0 - 5.5)
+            jd = birth_jd(dob, h24, m)
             
             ayan_map = {
                 "ಲಾಹಿರಿ": swe.SIDM_LAHIRI, 
@@ -934,25 +490,21 @@ if st.session_state.page == "input":
             
             node_mode = swe.TRUE_NODE if node_sel == "ನಿಜ ರಾಹು" else swe.MEAN_NODE
             
-            p1, p2, p3, p4, p5 = get_full_calculations(jd, lat, lon, dob, ayan_mode, node_mode)
-            
-            if p1 and p2:
-                st.session_state.data = {
-                    "pos": p1, "pan": p2, "details": p3, "bhavas": p4, "speeds": p5
-                }
+            try:
+                chart = get_full_calculations_cached(jd, lat, lon, dob, ayan_mode, node_mode)
+            except ChartError as e:
+                # One message per failure; the generic one only if the error carries none
+                st.error(str(e) or "ಜಾತಕ ಲೆಕ್ಕಾಚಾರದಲ್ಲಿ ವಿಫಲವಾಗಿದೆ. ದಯವಿಟ್ಟು ದಿನಾಂಕ/ಸಮಯ ಪರಿಶೀಲಿಸಿ.")
+            else:
+                st.session_state.data = {"chart": chart}
                 st.session_state.page = "dashboard"
                 st.rerun()
-            else:
-                st.error("ಜಾತಕ ಲೆಕ್ಕಾಚಾರದಲ್ಲಿ ವಿಫಲವಾಗಿದೆ. ದಯವಿಟ್ಟು ದಿನಾಂಕ/ಸಮಯ ಪರಿಶೀಲಿಸಿ.")
         st.markdown("</div>", unsafe_allow_html=True)
 
 elif st.session_state.page == "dashboard" and st.session_state.data:
     try:
-        pos = st.session_state.data.get('pos', {})
-        pan = st.session_state.data.get('pan', {})
-        details = st.session_state.data.get('details', {})
-        bhavas = st.session_state.data.get('bhavas', [])
-        speeds = st.session_state.data.get('speeds', {})
+        # Kannada-keyed views are built from the chart arrays once per render
+        pos, pan, details, bhavas, speeds = st.session_state.data['chart']
         sav_vals = pan.get('sav_bindus', [0]*12)
         bav_vals = pan.get('bav_bindus', {})
         adv_sp = pan.get('adv_sphutas', {})
@@ -980,7 +532,7 @@ elif st.session_state.page == "dashboard" and st.session_state.data:
             if n_val == "":
                 n_val = "Unknown_" + d_str
                 
-            save_db(n_val, prof_data)
+            get_store().save(n_val, prof_data)
             st.success("ಉಳಿಸಲಾಗಿದೆ!")
         
         tabs = ["ಕುಂಡಲಿ", "ಗ್ರಹ ಸ್ಫುಟ", "ಉಪಗ್ರಹ ಸ್ಫುಟ", "ಆರೂಢ", "ದಶ", "ಪಂಚಾಂಗ", "ಭಾವ", "ಅಷ್ಟಕವರ್ಗ", "ಟಿಪ್ಪಣಿ", "ಚಂದಾದಾರಿಕೆ", "ಬಗ್ಗೆ"]
@@ -989,16 +541,8 @@ elif st.session_state.page == "dashboard" and st.session_state.data:
         with t1:
             c_v, c_b = st.columns(2)
             
-            d_names = {
-                1: "ರಾಶಿ", 
-                2: "ಹೋರಾ",
-                3: "ದ್ರೇಕ್ಕಾಣ", 
-                9: "ನವಾಂಶ", 
-                12: "ದ್ವಾದಶಾಂಶ", 
-                30: "ತ್ರಿಂಶಾಂಶ"
-            }
-            
-            opts = [1, 2, 3, 9, 12, 30]
+            d_names = KN_VARGA
+            opts = list(SHODASHAVARGA)
             v_opt_base = c_v.selectbox("ವರ್ಗ", opts, format_func=lambda x: d_names[x])
             
             mode_opts = ["ರಾಶಿ", "ಭಾವ", "ನವಾಂಶ"]
@@ -1028,52 +572,14 @@ elif st.session_state.page == "dashboard" and st.session_state.data:
                     render_items.append(k)
                     render_pos[k] = v
             
-            for n in render_items:
-                if n not in render_pos: continue
-                d = render_pos[n]
-                if v_opt == 1: 
-                    if not b_opt:
-                        ri = int(d/30)
-                    else:
-                        ri = (int(ld/30) + int(((d - ld + 360)%360 + 15)/30)) % 12
-                elif v_opt == 2:
-                    r = int(d/30)
-                    dr = d % 30
-                    is_odd_sign = (r % 2 == 0)
-                    if is_odd_sign:
-                        if dr < 15: ri = 4 
-                        else: ri = 3 
-                    else:
-                        if dr < 15: ri = 3 
-                        else: ri = 4 
-                elif v_opt == 30: 
-                    r = int(d/30)
-                    dr = d%30
-                    is_odd = (r % 2 == 0)
-                    if is_odd:
-                        if dr < 5: ri = 0
-                        elif dr < 10: ri = 10
-                        elif dr < 18: ri = 8
-                        elif dr < 25: ri = 2
-                        else: ri = 6
-                    else:
-                        if dr < 5: ri = 5
-                        elif dr < 12: ri = 2
-                        elif dr < 20: ri = 8
-                        elif dr < 25: ri = 10
-                        else: ri = 0
-                elif v_opt == 9: 
-                    block = int(d/30)%4
-                    start = [0, 9, 6, 3][block]
-                    steps = int((d%30)/3.33333)
-                    ri = (start + steps) % 12
-                elif v_opt == 3: 
-                    ri = (int(d/30) + (int((d%30)/10)*4)) % 12
-                elif v_opt == 12: 
-                    ri = (int(d/30) + int((d%30)/2.5)) % 12
-                else: 
-                    ri = int(d/30)
-                    
+            render_items = [n for n in render_items if n in render_pos]
+            render_degs = [render_pos[n] for n in render_items]
+            if b_opt:
+                r_idx = bhava_indices(render_degs, ld)
+            else:
+                r_idx = varga_indices(render_degs, v_opt)
+            
+            for n, ri in zip(render_items, r_idx.tolist()):
                 if n in ["ಲಗ್ನ", "ಮಾಂದಿ"]:
                     cls = "hi"
                 elif n in adv_sp:
@@ -1216,51 +722,40 @@ elif st.session_state.page == "dashboard" and st.session_state.data:
             st.markdown(ht, unsafe_allow_html=True)
             
             if 'date_obj' in pan:
-                dlines = []
-                cur_d = pan['date_obj']
-                si = pan.get('n_idx', 0) % 9
-                perc = pan.get('perc', 0)
+                d_seed = (pan['date_obj'], pan.get('n_idx', 0), pan.get('perc', 0))
                 
-                for i in range(9):
-                    im = (si + i) % 9
-                    y_mul = (1 - perc) if i == 0 else 1
-                    md_dur = YEARS[im] * y_mul
-                    md_end = cur_d + datetime.timedelta(days=md_dur*365.25)
-                    
-                    dlines.append("<details><summary class='md-node'><span>")
-                    dlines.append(LORDS[im] + "</span><span class='date-label'>")
-                    dlines.append(md_end.strftime('%d-%m-%y') + "</span></summary>")
-                    
-                    cad = cur_d
-                    for j in range(9):
-                        ia = (im + j) % 9
-                        ad_y = (YEARS[im] * YEARS[ia] / 120.0)
-                        if i == 0: ad_y *= (1 - perc)
-                        ae = cad + datetime.timedelta(days=ad_y*365.25)
-                        
-                        dlines.append("<details><summary class='ad-node'><span>")
-                        dlines.append(LORDS[ia] + "</span><span class='date-label'>")
-                        dlines.append(ae.strftime('%d-%m-%y') + "</span></summary>")
-                        
-                        cpd = cad
-                        for k in range(9):
-                            ip = (ia + k) % 9
-                            pd_y = (ad_y * YEARS[ip] / 120.0)
-                            pe = cpd + datetime.timedelta(days=pd_y*365.25)
-                            
-                            p_div = "<div class='pd-node' style='padding:10px 15px; "
-                            p_div += "border-bottom:1px solid #EDF2F7; display:flex; "
-                            p_div += "justify-content:space-between'><span>"
-                            p_div += LORDS[ip] + "</span><span>" 
-                            p_div += pe.strftime('%d-%m-%y') + "</span></div>"
-                            
-                            dlines.append(p_div)
-                            cpd = pe
-                        dlines.append("</details>")
-                        cad = ae
-                    dlines.append("</details>")
-                    cur_d = md_end
-                    
+                def p_label(p):
+                    return LORDS[p.lord] + " (" + p.end.strftime('%d-%m-%y') + ")"
+                
+                running = dasha_at(*d_seed, datetime.datetime.now(), depth=5)
+                if running:
+                    r_txt = " / ".join(LORDS[p.lord] for p in running)
+                    ht = "<div class='card'><b>ಈಗ ನಡೆಯುತ್ತಿರುವ ದಶೆ:</b> " + r_txt
+                    ht += "<span class='date-label'>" + running[-1].end.strftime('%d-%m-%y') + "</span></div>"
+                    st.markdown(ht, unsafe_allow_html=True)
+                
+                # Only the chosen branch is expanded; every level is nine periods
+                cd1, cd2, cd3 = st.columns(3)
+                md_list = list(maha_dashas(*d_seed))
+                md = cd1.selectbox(KN_DASHA_LEVELS[0], md_list, format_func=p_label)
+                ad_list = list(sub_periods(md))
+                ad = cd2.selectbox(KN_DASHA_LEVELS[1], ad_list, format_func=p_label)
+                pd_list = list(sub_periods(ad))
+                pdp = cd3.selectbox(KN_DASHA_LEVELS[2], pd_list, format_func=p_label)
+                
+                dlines = []
+                dlines.append("<div class='card' style='padding:0;'>")
+                dlines.append("<div class='md-node' style='padding:14px;'><span>")
+                dlines.append(KN_DASHA_LEVELS[3] + ": " + " / ".join(LORDS[l] for l in pdp.lords))
+                dlines.append("</span></div>")
+                for sd in sub_periods(pdp):
+                    p_div = "<div class='pd-node' style='padding:10px 15px; "
+                    p_div += "border-bottom:1px solid #EDF2F7; display:flex; "
+                    p_div += "justify-content:space-between'><span>"
+                    p_div += LORDS[sd.lord] + "</span><span>" 
+                    p_div += sd.end.strftime('%d-%m-%y') + "</span></div>"
+                    dlines.append(p_div)
+                dlines.append("</div>")
                 st.markdown("".join(dlines), unsafe_allow_html=True)
         
         with t5:
@@ -0,0 +1,35 @@
+import datetime
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bharatheeyam import BirthRecord, compute_charts
+
+
+def sample_records(n, seed=11):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        dob = datetime.date(rnd.randint(1900, 2030), rnd.randint(1, 12), rnd.randint(1, 28))
+        out.append(BirthRecord(dob, rnd.randint(0, 23), rnd.randint(0, 59),
+                               rnd.uniform(8, 34), rnd.uniform(68, 97)))
+    return out
+
+
+def main(n=2000, worker_counts=(1, 2, 4, 8)):
+    records = sample_records(n)
+    base = None
+    for w in worker_counts:
+        t0 = time.perf_counter()
+        count = sum(1 for _ in compute_charts(records, workers=w))
+        elapsed = time.perf_counter() - t0
+        rate = count / elapsed
+        base = base or rate
+        print(f"workers={w:<2} charts={count}  {rate:8.1f} charts/s  scaling {rate / base:4.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
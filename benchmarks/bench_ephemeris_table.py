@@ -0,0 +1,59 @@
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import swisseph as swe
+
+from bharatheeyam import ERROR_BOUND_ARCSEC, EphemerisTable, build_ephemeris_table, sidereal_mode
+
+
+def live_positions(jds, bodies, ayan_mode):
+    flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+    lon = np.empty((len(jds), len(bodies)))
+    with sidereal_mode(ayan_mode):
+        for i, jd in enumerate(jds):
+            for j, body in enumerate(bodies):
+                lon[i, j] = swe.calc_ut(jd, body, flag)[0][0]
+    return lon
+
+
+def main(start_year=1900, end_year=2000, n=20000, seed=3):
+    t0 = time.perf_counter()
+    table = build_ephemeris_table(start_year, end_year)
+    t_build = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "ephe_table")
+        table.save(path)
+        table = EphemerisTable.load(path)
+
+        rnd = random.Random(seed)
+        jds = np.array([rnd.uniform(table.start_jd, table.end_jd) for _ in range(n)])
+
+        t0 = time.perf_counter()
+        lon, _ = table.positions(jds)
+        t_table = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        live = live_positions(jds, table.bodies, table.ayan_mode)
+        t_live = time.perf_counter() - t0
+
+    err = np.abs((lon - live + 180) % 360 - 180) * 3600
+    print(f"table                : {start_year}-{end_year}, step {table.step} d, "
+          f"{table.data.nbytes / 1e6:.1f} MB, built in {t_build:.1f} s")
+    print(f"lookups              : {n} dates x {len(table.bodies)} bodies")
+    print(f"live swisseph        : {t_live * 1e3:.1f} ms")
+    print(f"table (vectorised)   : {t_table * 1e3:.1f} ms   ({t_live / t_table:.0f}x)")
+    for body, e in zip(table.bodies, err.max(axis=0)):
+        print(f"  {swe.get_planet_name(body):<12} max err {e:.3f}\"")
+    worst = err.max()
+    print(f"worst error          : {worst:.3f}\" (documented bound {ERROR_BOUND_ARCSEC}\")")
+
+
+if __name__ == "__main__":
+    main()
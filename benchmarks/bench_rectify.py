@@ -0,0 +1,67 @@
+import datetime
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import swisseph as swe
+
+from bharatheeyam import BirthRecord, get_full_calculations, rectification_sweep
+
+
+def sample_records(n, seed=5):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        dob = datetime.date(1940, 1, 1) + datetime.timedelta(days=rnd.randint(0, 30000))
+        out.append(BirthRecord(dob, rnd.randint(0, 23), rnd.randint(0, 59),
+                               rnd.uniform(8, 32), rnd.uniform(70, 92)))
+    return out
+
+
+def per_minute(rec, minutes):
+    # What a naive sweep does: the full engine at every minute of the window
+    out = []
+    for k in range(-minutes, minutes + 1):
+        jd = rec.jd() + k / 1440.0
+        y, m, d, _ = swe.revjul(jd + rec.tz_offset / 24.0)
+        out.append(get_full_calculations(jd, rec.lat, rec.lon, datetime.date(y, m, d),
+                                         rec.ayan_mode, rec.node_mode))
+    return out
+
+
+def main(n=40, minutes=30):
+    records = sample_records(n)
+
+    t0 = time.perf_counter()
+    naive = [per_minute(rec, minutes) for rec in records]
+    t_naive = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sweeps = [rectification_sweep(rec, minutes) for rec in records]
+    events = [sw.events() for sw in sweeps]
+    t_events = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    charts = [[sw.chart_at(rec.jd() + k / 1440.0) for k in range(-minutes, minutes + 1)]
+              for rec, sw in zip(records, sweeps)]
+    t_charts = time.perf_counter() - t0
+
+    worst = 0.0
+    for a_list, b_list in zip(naive, charts):
+        for a, b in zip(a_list, b_list):
+            worst = max(worst, np.abs((a.lon - b.lon + 180) % 360 - 180).max() * 3600)
+
+    print(f"charts               : {n}, +-{minutes} min")
+    print(f"engine every minute  : {t_naive / n * 1e3:.1f} ms/chart")
+    print(f"sweep events         : {t_events / n * 1e3:.2f} ms/chart   "
+          f"({sum(len(e) for e in events) / n:.1f} events/chart)")
+    print(f"sweep chart_at/minute: {t_charts / n * 1e3:.1f} ms/chart")
+    print(f"max longitude diff   : {worst:.3f}\"")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ENDPOINTS = ("/chart", "/panchanga", "/dasha", "/ashtakavarga")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def sample_queries(n, unique, seed=11):
+    # `unique` distinct births spread over n requests and the four endpoints,
+    # so repeats exercise the cache and concurrent repeats the coalescing
+    rnd = random.Random(seed)
+    births = []
+    for _ in range(unique):
+        births.append(f"date={rnd.randint(1940, 2020)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+                      f"&time={rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}"
+                      f"&lat={rnd.uniform(8, 32):.4f}&lon={rnd.uniform(70, 92):.4f}")
+    return [f"{rnd.choice(ENDPOINTS)}?{rnd.choice(births)}" for _ in range(n)]
+
+
+async def request(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                  if line.lower().startswith(b"content-length"))
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port, queue, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while queue:
+            target = queue.pop()
+            t0 = time.perf_counter()
+            status = await request(reader, writer, target)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def wait_ready(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await request(reader, writer, "/stats")
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def fetch_stats(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+
+async def load(port, queries, concurrency):
+    queue = list(reversed(queries))
+    latencies, errors = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(port, queue, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    return latencies, errors, elapsed, await fetch_stats(port)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100.0 * len(values)))]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--unique", type=int, default=500)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    port = free_port()
+    cmd = [sys.executable, "-m", "bharatheeyam.server", "--port", str(port)]
+    if args.workers:
+        cmd += ["--workers", str(args.workers)]
+    proc = subprocess.Popen(cmd, cwd=ROOT)
+    try:
+        asyncio.run(wait_ready(port))
+        queries = sample_queries(args.requests, args.unique)
+        latencies, errors, elapsed, stats = asyncio.run(load(port, queries, args.concurrency))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    print(f"requests             : {len(latencies)} ({args.unique} distinct births), "
+          f"concurrency {args.concurrency}, workers {stats['workers']}")
+    print(f"throughput           : {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency p50          : {percentile(latencies, 50) * 1e3:.2f} ms")
+    print(f"latency p99          : {percentile(latencies, 99) * 1e3:.2f} ms")
+    print(f"charts computed      : {stats['computed']}   coalesced {stats['coalesced']}   "
+          f"cache hits {stats['hits']}")
+    print(f"errors               : {len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
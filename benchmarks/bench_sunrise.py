@@ -0,0 +1,85 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import swisseph as swe
+
+from bharatheeyam import solar
+
+
+class CountingSwe:
+    def __init__(self, mod):
+        self._mod = mod
+        self.calls = 0
+
+    def calc_ut(self, *args):
+        self.calls += 1
+        return self._mod.calc_ut(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._mod, name)
+
+
+def sample_places(n, seed=7):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        y = rnd.randint(1850, 2090)
+        m = rnd.randint(1, 12)
+        d = rnd.randint(1, 28)
+        lat = rnd.uniform(-50, 60)
+        lon = rnd.uniform(-180, 180) if rnd.random() < 0.3 else rnd.uniform(68, 97)
+        out.append((y, m, d, lat, lon))
+    return out
+
+
+def sample_polar(n, seed=9):
+    # Near the polar circles around the solstices, where the Sun grazes
+    # the horizon and the closed-form estimate has to hand over to the scan
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        y = rnd.randint(1900, 2090)
+        m = rnd.choice((5, 6, 7, 11, 12, 1))
+        d = rnd.randint(1, 28)
+        lat = rnd.uniform(63, 70) * rnd.choice((1, -1))
+        out.append((y, m, d, lat, rnd.uniform(-180, 180)))
+    return out
+
+
+def run(method, cases):
+    counter = CountingSwe(swe)
+    solar.swe = counter
+    try:
+        t0 = time.perf_counter()
+        res = [solar.find_sunrise_set_for_date(*c, method=method) for c in cases]
+        elapsed = time.perf_counter() - t0
+    finally:
+        solar.swe = swe
+    return res, elapsed, counter.calls
+
+
+def main(n=300, tolerance=0.5):
+    cases = sample_places(n) + sample_polar(n // 3)
+    n = len(cases)
+    scan, t_scan, c_scan = run("scan", cases)
+    fast, t_fast, c_fast = run("newton", cases)
+
+    worst = 0.0
+    for a, b in zip(scan, fast):
+        worst = max(worst, abs(a[0] - b[0]) * 86400, abs(a[1] - b[1]) * 86400)
+
+    print(f"cases                : {n}")
+    print(f"scan   calc_ut/call  : {c_scan / n:.1f}   {t_scan / n * 1e3:.3f} ms/call")
+    print(f"newton calc_ut/call  : {c_fast / n:.1f}   {t_fast / n * 1e3:.3f} ms/call")
+    print(f"speedup              : {t_scan / t_fast:.1f}x")
+    print(f"max |diff| (seconds) : {worst:.3f}")
+    if worst > tolerance:
+        sys.exit(f"newton and scan differ by {worst:.3f} s (tolerance {tolerance} s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,64 @@
+import swisseph as swe
+
+from .ashtakavarga import (
+    BAV_TENSOR, ashtakavarga_batch, ashtakavarga_from_longitudes, calculate_ashtakavarga
+)
+from .batch import compute_charts
+from .cache import chart_cache, chart_key, get_full_calculations_cached
+from .chart import (
+    BirthRecord, ChartResult, birth_jd, calculate_mandi, compute_record,
+    get_full_calculations
+)
+from .chart_store import (
+    STORE_COLUMNS, ChartStore, ChartStoreWriter, chart_row, write_chart_store
+)
+from .constants import (
+    KN_NAK, KN_PLANETS, KN_RASHI, KN_SPHUTAS, KN_TITHI, KN_VARA, KN_VARGA, KN_YOGA,
+    LORDS, PANCHANGA_FIELDS, PLANET_ORDER, YEARS, Planet
+)
+from .dasha import (
+    KN_DASHA_LEVELS, DashaPeriod, DashaState, antardasha_changes, dasha_at,
+    dasha_state, days_to_datetime64, jd_to_days, maha_dashas, moon_dasha_seed,
+    sub_periods, to_days, walk
+)
+from .ephe import SiderealGate, sidereal_mode
+from .ephemeris_table import (
+    ERROR_BOUND_ARCSEC, TABLE_BODIES, EphemerisTable, build_ephemeris_table
+)
+from .errors import ChartError
+from .formatting import fmt_deg, fmt_ghati
+from .gazetteer import Gazetteer, Place, load_gazetteer
+from .gochara import (
+    GOCHARA_BODIES, GocharaScores, gochara_from_store, gochara_scores, transit_rashis
+)
+from .lagna import (
+    LagnaChange, lagna_cache, lagna_day, lagna_intervals, lagna_longitude, lagna_timetable
+)
+from .lru import CacheStats, LRUCache
+from .lunar import find_nak_limit
+from .matching import (
+    KN_KOOTAS, KN_PORUTHAMS, MatchPool, MatchResult, ashtakoota, kuja_dosha,
+    pool_from_store, porutham, rank_matches
+)
+from .muhurta import (
+    RAHU_KALA_PART, MuhurtaWindow, find_muhurtas, limb_intervals, rahu_kala_intervals
+)
+from .panchanga import PanchangaDay, karana_name, panchanga_calendar
+from .profiles import ProfilePage, ProfileStore
+from .rectify import (
+    DASHA_CHANGE, KN_RECTIFY_KINDS, LAGNA_CHANGE, MANDI_CHANGE, NAVAMSA_CHANGE,
+    RectificationSweep, RectifyEvent, rectification_sweep
+)
+from .solar import (
+    find_sunrise_set_for_date, get_altitude_manual, load_solar_cache,
+    save_solar_cache, solar_cache, sunrise_sunset
+)
+from .transit import (
+    KN_TRANSIT_KINDS, NAK_INGRESS, RASHI_INGRESS, STATION_DIRECT, STATION_RETRO,
+    TransitEvent, TransitTable, scan_transits
+)
+from .varga import (
+    SHODASHAVARGA, bhava_indices, shodashavarga, varga_indices, varga_longitude
+)
+
+swe.set_ephe_path(None)
@@ -0,0 +1,78 @@
+import numpy as np
+
+BAV_TARGETS = ["ರವಿ", "ಚಂದ್ರ", "ಕುಜ", "ಬುಧ", "ಗುರು", "ಶುಕ್ರ", "ಶನಿ"]
+P_KEYS = BAV_TARGETS + ["ಲಗ್ನ"]
+
+BAV_RULES = {
+    "ರವಿ": [
+        [1,2,4,7,8,9,10,11], [3,6,10,11], [1,2,4,7,8,9,10,11], 
+        [3,5,6,9,10,11,12], [5,6,9,11], [6,7,12], 
+        [1,2,4,7,8,9,10,11], [3,4,6,10,11,12]
+    ],
+    "ಚಂದ್ರ": [
+        [3,6,7,8,10,11], [1,3,6,7,10,11], [2,3,5,6,9,10,11],
+        [1,3,4,5,7,8,10,11], [1,4,7,8,10,11,12], [3,4,5,7,9,10,11],
+        [3,5,6,11], [3,6,10,11]
+    ],
+    "ಕುಜ": [
+        [3,5,6,10,11], [3,6,11], [1,2,4,7,8,10,11],
+        [3,5,6,11], [6,10,11,12], [6,8,11,12],
+        [1,4,7,8,9,10,11], [1,3,6,10,11]
+    ],
+    "ಬುಧ": [
+        [5,6,9,11,12], [2,4,6,8,10,11], [1,2,4,7,8,9,10,11],
+        [1,3,5,6,9,10,11,12], [6,8,11,12], [1,2,3,4,5,8,9,11],
+        [1,2,4,7,8,9,10,11], [1,2,4,6,8,10,11]
+    ],
+    "ಗುರು": [
+        [1,2,3,4,7,8,9,10,11], [2,5,7,9,11], [1,2,4,7,8,10,11],
+        [1,2,4,5,6,9,10,11], [1,2,3,4,7,8,10,11], [2,5,6,9,10,11],
+        [3,5,6,12], [1,2,4,5,6,9,10,11]
+    ],
+    "ಶುಕ್ರ": [
+        [8,11,12], [1,2,3,4,5,8,9,11,12], [3,5,6,9,11,12],
+        [3,5,6,9,11], [5,8,9,10,11], [1,2,3,4,5,8,9,10,11],
+        [3,4,5,8,9,10,11], [1,2,3,4,5,8,9,11]
+    ],
+    "ಶನಿ": [
+        [1,2,4,7,8,10,11], [3,6,11], [3,5,6,10,11,12],
+        [6,8,9,10,11,12], [5,6,11,12], [6,11,12],
+        [3,5,6,11], [1,3,4,6,10,11]
+    ]
+}
+
+# BAV_TENSOR[target, reference, h] is 1 when the reference planet gives a
+# bindu to the target in the (h + 1)th house from itself
+BAV_TENSOR = np.zeros((7, 8, 12), dtype=np.int8)
+for _t, _target in enumerate(BAV_TARGETS):
+    for _r, _houses in enumerate(BAV_RULES[_target]):
+        BAV_TENSOR[_t, _r, [h - 1 for h in _houses]] = 1
+BAV_TENSOR.setflags(write=False)
+
+# The same rules rolled to every rashi the reference can occupy:
+# BAV_BY_RASHI[reference, rashi] is the (7, 12) bindu grid that reference adds
+BAV_BY_RASHI = np.ascontiguousarray(np.stack(
+    [np.roll(BAV_TENSOR, r, axis=2).transpose(1, 0, 2) for r in range(12)], axis=1
+), dtype=np.int16)
+SAV_BY_RASHI = np.ascontiguousarray(BAV_BY_RASHI.sum(axis=2), dtype=np.int16)
+BAV_BY_RASHI.setflags(write=False)
+SAV_BY_RASHI.setflags(write=False)
+
+def ashtakavarga_batch(rashis):
+    # rashis: (N, 8) rashi indices in P_KEYS order -> bav (N, 7, 12), sav (N, 12)
+    rashis = np.asarray(rashis, dtype=np.int64) % 12
+    bav = BAV_BY_RASHI[0][rashis[:, 0]]
+    sav = SAV_BY_RASHI[0][rashis[:, 0]]
+    for ref in range(1, 8):
+        bav += BAV_BY_RASHI[ref][rashis[:, ref]]
+        sav += SAV_BY_RASHI[ref][rashis[:, ref]]
+    return bav, sav
+
+def ashtakavarga_from_longitudes(longitudes):
+    # longitudes: (N, 8) sidereal degrees in P_KEYS order
+    return ashtakavarga_batch((np.asarray(longitudes, dtype=float) % 360 // 30).astype(np.int64))
+
+def calculate_ashtakavarga(positions):
+    r_idx = [int(positions[k] / 30) for k in P_KEYS]
+    bav, sav = ashtakavarga_batch([r_idx])
+    return sav[0].tolist(), {p: bav[0, i].tolist() for i, p in enumerate(BAV_TARGETS)}
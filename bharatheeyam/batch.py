@@ -0,0 +1,50 @@
+import collections
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import swisseph as swe
+
+from .chart import compute_record
+from .errors import ChartError
+
+def _init_worker():
+    swe.set_ephe_path(None)
+
+def _compute_chunk(chunk, return_exceptions):
+    out = []
+    for rec in chunk:
+        try:
+            out.append(compute_record(rec))
+        except ChartError as e:
+            if not return_exceptions:
+                raise
+            out.append(e)
+    return out
+
+def _chunked(records, size):
+    it = iter(records)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def compute_charts(records, workers=None, chunksize=32, return_exceptions=False):
+    # Yields one ChartResult per BirthRecord, in input order. Only about
+    # 2 * workers chunks are in flight, so arbitrarily long iterables stream.
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunked(records, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _compute_chunk(chunk, return_exceptions)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(ex.submit(_compute_chunk, chunk, return_exceptions))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,21 @@
+from .chart import get_full_calculations
+from .lru import LRUCache
+
+_MISSING = object()
+
+chart_cache = LRUCache(maxsize=512, ttl=6 * 3600.0)
+
+def chart_key(jd_birth, lat, lon, dob_obj, ayan_mode, node_mode):
+    # ~1 ms in time and ~0.1 m in place; dob is part of the key because Mandi uses the civil date
+    return (round(jd_birth, 8), round(float(lat), 6), round(float(lon), 6),
+            dob_obj.toordinal(), int(ayan_mode), int(node_mode))
+
+def get_full_calculations_cached(jd_birth, lat, lon, dob_obj, ayan_mode, node_mode, cache=None):
+    cache = chart_cache if cache is None else cache
+    key = chart_key(jd_birth, lat, lon, dob_obj, ayan_mode, node_mode)
+    res = cache.get(key, _MISSING)
+    if res is _MISSING:
+        res = get_full_calculations(jd_birth, lat, lon, dob_obj, ayan_mode, node_mode)
+        cache.put(key, res)
+    # Callers get their own arrays so nothing they do can alter the cached chart
+    return res.copy()
@@ -0,0 +1,317 @@
+import datetime
+from typing import NamedTuple
+
+import numpy as np
+import swisseph as swe
+
+from .ashtakavarga import BAV_TARGETS, ashtakavarga_from_longitudes
+from .constants import (
+    KN_NAK, KN_RASHI, KN_SPHUTAS, KN_TITHI, KN_VARA, KN_YOGA, LORDS, PLANET_ORDER,
+    YEARS, Planet
+)
+from .ephe import sidereal_mode
+from .errors import ChartError
+from .formatting import fmt_ghati
+from .lunar import find_nak_limit
+from .panchanga import karana_name
+from .solar import sunrise_sunset
+
+IST_OFFSET = 5.5
+
+class ChartResult:
+    # Array-backed chart: bodies are indexed by Planet, sphutas by KN_SPHUTAS
+    # and the panchanga by PANCHANGA_FIELDS. Kannada-keyed dicts are only
+    # built at render time; unpacking still gives the old
+    # (positions, pan, details, bhavas, speeds) five-tuple.
+    __slots__ = ("jd", "lon", "speed", "cusps", "sav", "bav", "sphutas",
+                 "panchanga", "sunrise", "nak_start", "nak_end", "perc")
+
+    def __init__(self, jd, lon, speed, cusps, sav, bav, sphutas, panchanga,
+                 sunrise, nak_start, nak_end, perc):
+        self.jd = jd
+        self.lon = lon
+        self.speed = speed
+        self.cusps = cusps
+        self.sav = sav
+        self.bav = bav
+        self.sphutas = sphutas
+        self.panchanga = panchanga
+        self.sunrise = sunrise
+        self.nak_start = nak_start
+        self.nak_end = nak_end
+        self.perc = perc
+
+    def __getstate__(self):
+        return tuple(getattr(self, k) for k in self.__slots__)
+
+    def __setstate__(self, state):
+        for k, v in zip(self.__slots__, state):
+            setattr(self, k, v)
+
+    def copy(self):
+        out = ChartResult.__new__(ChartResult)
+        out.__setstate__(tuple(v.copy() if isinstance(v, np.ndarray) else v
+                               for v in self.__getstate__()))
+        return out
+
+    def __iter__(self):
+        return iter((self.positions, self.pan, self.details, self.bhavas, self.speeds))
+
+    def longitude(self, planet):
+        return float(self.lon[planet])
+
+    @property
+    def nak(self):
+        return (self.lon / 13.333333333).astype(np.int64) % 27
+
+    @property
+    def pada(self):
+        return ((self.lon % 13.333333333) / 3.333333333).astype(np.int64) + 1
+
+    @property
+    def positions(self):
+        return dict(zip(PLANET_ORDER, self.lon.tolist()))
+
+    @property
+    def speeds(self):
+        return dict(zip(PLANET_ORDER, self.speed.tolist()))
+
+    @property
+    def details(self):
+        return {p: {"nak": KN_NAK[n], "pada": d}
+                for p, n, d in zip(PLANET_ORDER, self.nak.tolist(), self.pada.tolist())}
+
+    @property
+    def bhavas(self):
+        return self.cusps.tolist()
+
+    @property
+    def pan(self):
+        t_idx, w_idx, n_idx, y_idx, k_idx, r_idx = self.panchanga.tolist()
+        jd, js, je, perc = self.jd, self.nak_start, self.nak_end, self.perc
+        bal = YEARS[n_idx % 9] * (1 - perc)
+        return {
+            "t": KN_TITHI[t_idx],
+            "v": KN_VARA[w_idx],
+            "n": KN_NAK[n_idx % 27],
+            "y": KN_YOGA[y_idx],
+            "k": karana_name(k_idx),
+            "r": KN_RASHI[r_idx],
+            "sr": self.sunrise,
+            "udayadi": fmt_ghati((jd - self.sunrise) * 60),
+            "gata": fmt_ghati((jd - js) * 60),
+            "parama": fmt_ghati((je - js) * 60),
+            "rem": fmt_ghati((je - jd) * 60),
+            "d_bal": str(int(bal)) + "ವ " + str(int((bal%1)*12)) + "ತಿ",
+            "n_idx": n_idx,
+            "perc": perc,
+            "date_obj": datetime.datetime.fromtimestamp((jd - 2440587.5) * 86400),
+            "lord_bal": LORDS[n_idx%9],
+            "sav_bindus": self.sav.tolist(),
+            "bav_bindus": dict(zip(BAV_TARGETS, self.bav.tolist())),
+            "adv_sphutas": dict(zip(KN_SPHUTAS, self.sphutas.tolist())),
+        }
+
+class BirthRecord(NamedTuple):
+    dob: datetime.date
+    hour: int
+    minute: int
+    lat: float
+    lon: float
+    ayan_mode: int = swe.SIDM_LAHIRI
+    node_mode: int = swe.TRUE_NODE
+    tz_offset: float = IST_OFFSET
+
+    def jd(self):
+        return birth_jd(self.dob, self.hour, self.minute, self.tz_offset)
+
+def birth_jd(dob, h24, minute, tz_offset=IST_OFFSET):
+    return swe.julday(dob.year, dob.month, dob.day, h24 + minute/60.0 - tz_offset)
+
+def compute_record(rec):
+    return get_full_calculations(rec.jd(), rec.lat, rec.lon, rec.dob, rec.ayan_mode, rec.node_mode)
+
+def calculate_mandi(jd_birth, lat, lon, dob_obj):
+    y = dob_obj.year
+    m = dob_obj.month
+    d = dob_obj.day
+    sr_civil, ss_civil = sunrise_sunset(y, m, d, lat, lon)
+    
+    py_weekday = dob_obj.weekday()
+    civil_weekday_idx = (py_weekday + 1) % 7 
+    
+    is_night = False
+    if jd_birth >= sr_civil and jd_birth < ss_civil: 
+        is_night = False
+    else: 
+        is_night = True
+        
+    start_base = 0.0
+    duration = 0.0
+    vedic_wday = 0
+    panch_sr = 0.0
+    
+    if not is_night:
+        vedic_wday = civil_weekday_idx
+        panch_sr = sr_civil
+        start_base = sr_civil
+        duration = ss_civil - sr_civil
+    else:
+        if jd_birth < sr_civil:
+            vedic_wday = (civil_weekday_idx - 1) % 7
+            prev_d = dob_obj - datetime.timedelta(days=1)
+            p_y = prev_d.year
+            p_m = prev_d.month
+            p_d = prev_d.day
+            p_sr, p_ss = sunrise_sunset(p_y, p_m, p_d, lat, lon)
+            start_base = p_ss
+            duration = sr_civil - p_ss
+            panch_sr = p_sr
+        else:
+            vedic_wday = civil_weekday_idx
+            next_d = dob_obj + datetime.timedelta(days=1)
+            n_y = next_d.year
+            n_m = next_d.month
+            n_d = next_d.day
+            n_sr, n_ss = sunrise_sunset(n_y, n_m, n_d, lat, lon)
+            start_base = ss_civil
+            duration = n_sr - ss_civil
+            panch_sr = sr_civil
+
+    if not is_night: 
+        factors = [26, 22, 18, 14, 10, 6, 2] 
+    else: 
+        factors = [10, 6, 2, 26, 22, 18, 14] 
+        
+    factor = factors[vedic_wday]
+    mandi_jd = start_base + (duration * factor / 30.0)
+    
+    return mandi_jd, is_night, panch_sr, vedic_wday, start_base
+
+def get_full_calculations(jd_birth, lat, lon, dob_obj, ayan_mode, node_mode):
+    with sidereal_mode(ayan_mode):
+        try:
+            return _calculate(jd_birth, lat, lon, dob_obj, node_mode)
+        except Exception as e:
+            raise ChartError(f"ಲೆಕ್ಕಾಚಾರದಲ್ಲಿ ದೋಷ: {str(e)}") from e
+
+# Swiss Ephemeris body for each graha slot
+_SWE_BODIES = (
+    (Planet.RAVI, swe.SUN), (Planet.CHANDRA, swe.MOON), (Planet.BUDHA, swe.MERCURY),
+    (Planet.SHUKRA, swe.VENUS), (Planet.KUJA, swe.MARS), (Planet.GURU, swe.JUPITER),
+    (Planet.SHANI, swe.SATURN),
+)
+# P_KEYS order (seven grahas then lagna) as Planet indices
+_AV_BODIES = [Planet.RAVI, Planet.CHANDRA, Planet.KUJA, Planet.BUDHA,
+              Planet.GURU, Planet.SHUKRA, Planet.SHANI, Planet.LAGNA]
+
+def _sphutas(S, M, J, V, Ma, R, Asc, Md):
+    # --- UPAGRAHAS & 16 ADVANCED SPHUTAS ---, in KN_SPHUTAS order
+    dhooma = (S + 133.333333) % 360
+    vyatipata = (360 - dhooma) % 360
+    parivesha = (vyatipata + 180) % 360
+    indrachapa = (360 - parivesha) % 360
+    upaketu = (indrachapa + 16.666667) % 360
+    
+    bhrigu = (M + R) / 2
+    beeja = (S + V + J) % 360
+    kshetra = (M + Ma + J) % 360
+    yogi = (S + M + 93.333333) % 360
+    trisphuta = (Asc + M + Md) % 360
+    chatusphuta = (trisphuta + S) % 360
+    panchasphuta = (chatusphuta + R) % 360
+    prana = (Asc * 5 + Md) % 360
+    deha = (M * 8 + Md) % 360
+    mrityu = (Md * 7 + S) % 360
+    sookshma = (prana + deha + mrityu) % 360
+    
+    return [
+        dhooma, vyatipata, parivesha, indrachapa, upaketu, bhrigu,
+        beeja, kshetra, yogi, trisphuta, chatusphuta,
+        panchasphuta, prana, deha, mrityu, sookshma
+    ]
+
+def _calculate(jd_birth, lat, lon, dob_obj, node_mode):
+    # Caller must hold sidereal_mode() for the chart's ayanamsa
+    positions, speeds = _grahas(jd_birth, node_mode)
+    return _complete(jd_birth, lat, lon, dob_obj, positions, speeds)
+
+def _grahas(jd_birth, node_mode):
+    # The ephemeris part of the chart: graha and node longitudes and speeds
+    positions = [0.0] * len(Planet)
+    speeds = [0.0] * len(Planet)
+    
+    flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+    for slot, pid in _SWE_BODIES:
+        res = swe.calc_ut(jd_birth, pid, flag)
+        positions[slot] = res[0][0] % 360
+        speeds[slot] = res[0][3]
+
+    rahu_res = swe.calc_ut(jd_birth, node_mode, flag)
+    rahu_deg = rahu_res[0][0] % 360
+    positions[Planet.RAHU] = rahu_deg
+    speeds[Planet.RAHU] = rahu_res[0][3]
+    positions[Planet.KETU] = (rahu_deg + 180) % 360
+    speeds[Planet.KETU] = rahu_res[0][3]
+    return positions, speeds
+
+def _mandi_longitude(mandi_time_jd, lat, lon):
+    h_mandi = swe.houses(mandi_time_jd, float(lat), float(lon), b'P')
+    a_mandi = swe.get_ayanamsa(mandi_time_jd)
+    return (h_mandi[1][0] - a_mandi) % 360
+
+def _memo(memo, key, fn, *args):
+    if memo is None:
+        return fn(*args)
+    if key not in memo:
+        memo[key] = fn(*args)
+    return memo[key]
+
+def _complete(jd_birth, lat, lon, dob_obj, positions, speeds, memo=None):
+    # Everything that depends on the moment and place given the grahas:
+    # houses, Mandi, panchanga, Ashtakavarga and sphutas. A memo dict shared
+    # across nearby moments keeps Mandi and the nakshatra limits, which only
+    # change with the day/night segment and the Moon's nakshatra.
+    ayan = swe.get_ayanamsa(jd_birth)
+    positions = list(positions)
+    rahu_deg = positions[Planet.RAHU]
+
+    houses_res = swe.houses(jd_birth, float(lat), float(lon), b'P')
+    cusps = houses_res[0]
+    
+    if len(cusps) == 13:
+        asc_deg = (cusps[1] - ayan) % 360
+        bhava_sphutas = [(cusps[i] - ayan) % 360 for i in range(1, 13)]
+    else:
+        asc_deg = (cusps[0] - ayan) % 360
+        bhava_sphutas = [(cusps[i] - ayan) % 360 for i in range(0, 12)]
+    positions[Planet.LAGNA] = asc_deg
+
+    mandi_time_jd, is_night, panch_sr, w_idx, debug_base = calculate_mandi(jd_birth, lat, lon, dob_obj)
+    positions[Planet.MANDI] = _memo(memo, ("mandi", mandi_time_jd), _mandi_longitude, mandi_time_jd, lat, lon)
+
+    m_deg = positions[Planet.CHANDRA]
+    s_deg = positions[Planet.RAVI]
+    t_idx = int(((m_deg - s_deg + 360) % 360) / 12)
+    n_idx = int(m_deg / 13.333333333)
+    y_idx = int(((m_deg + s_deg) % 360) / 13.333333333)
+    k_idx = int(((m_deg - s_deg + 360) % 360) / 6)
+    r_idx = int(m_deg / 30)
+    
+    js = _memo(memo, ("nak", n_idx, 0), find_nak_limit, jd_birth, n_idx * 13.333333333)
+    je = _memo(memo, ("nak", n_idx, 1), find_nak_limit, jd_birth, (n_idx + 1) * 13.333333333)
+    perc = (m_deg % 13.333333333) / 13.333333333
+    
+    lon_arr = np.array(positions)
+    bav, sav = ashtakavarga_from_longitudes(lon_arr[_AV_BODIES][None, :])
+    
+    sphutas = _sphutas(
+        s_deg, m_deg, positions[Planet.GURU], positions[Planet.SHUKRA],
+        positions[Planet.KUJA], rahu_deg, asc_deg, positions[Planet.MANDI]
+    )
+    
+    return ChartResult(
+        jd_birth, lon_arr, np.array(speeds), np.array(bhava_sphutas), sav[0], bav[0],
+        np.array(sphutas), np.array([min(t_idx, 29), w_idx, n_idx, y_idx, k_idx, r_idx]),
+        panch_sr, js, je, perc
+    )
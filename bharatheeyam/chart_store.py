@@ -0,0 +1,160 @@
+import json
+import math
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .ashtakavarga import BAV_TARGETS
+from .constants import KN_SPHUTAS, PANCHANGA_FIELDS, PLANET_ORDER
+
+# One .npy file per column plus meta.json, so every column can be opened with
+# np.load(mmap_mode="r") and scanned without copying. Rows past meta["count"]
+# are preallocated space and are never exposed.
+STORE_VERSION = 1
+STORE_COLUMNS = {
+    "jd": ("f8", ()),
+    "lat": ("f8", ()),
+    "lon": ("f8", ()),
+    "longitude": ("f8", (len(PLANET_ORDER),)),
+    "speed": ("f8", (len(PLANET_ORDER),)),
+    "nak": ("i1", (len(PLANET_ORDER),)),
+    "pada": ("i1", (len(PLANET_ORDER),)),
+    "cusps": ("f8", (12,)),
+    "sav": ("i2", (12,)),
+    "bav": ("i1", (len(BAV_TARGETS), 12)),
+    "sphutas": ("f8", (len(KN_SPHUTAS),)),
+    "panchanga": ("i1", (6,)),
+    "sunrise": ("f8", ()),
+    "dasha_perc": ("f8", ()),
+}
+
+def _column_file(path, name):
+    return os.path.join(path, name + ".npy")
+
+def _meta_file(path):
+    return os.path.join(path, "meta.json")
+
+def chart_row(result):
+    # ChartResult -> {column: value}; the arrays already use the store's order
+    return {
+        "longitude": result.lon,
+        "speed": result.speed,
+        "nak": result.nak,
+        "pada": result.pada,
+        "cusps": result.cusps,
+        "sav": result.sav,
+        "bav": result.bav,
+        "sphutas": result.sphutas,
+        "panchanga": result.panchanga,
+        "sunrise": result.sunrise,
+        "dasha_perc": result.perc,
+    }
+
+class ChartStoreWriter:
+    def __init__(self, path, capacity=1024):
+        self.path = str(path)
+        os.makedirs(self.path, exist_ok=True)
+        self.count = 0
+        self.capacity = 0
+        self._cols = {}
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity):
+        # Reallocates every column at the new capacity; callers only pay for
+        # this O(log n) times since capacity doubles
+        for name, (dtype, shape) in STORE_COLUMNS.items():
+            target = _column_file(self.path, name)
+            new = open_memmap(target + ".tmp", mode="w+", dtype=dtype, shape=(capacity,) + shape)
+            old = self._cols.get(name)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            if np.issubdtype(new.dtype, np.floating):
+                new[self.count:] = np.nan
+            new.flush()
+            self._cols[name] = None
+            del old
+            os.replace(target + ".tmp", target)
+            self._cols[name] = new
+        self.capacity = capacity
+
+    def append(self, result, jd=math.nan, lat=math.nan, lon=math.nan):
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        row = chart_row(result)
+        row["jd"], row["lat"], row["lon"] = jd, lat, lon
+        for name, value in row.items():
+            self._cols[name][i] = value
+        self.count += 1
+        return i
+
+    def extend(self, results, records=None):
+        # records: matching BirthRecords, to fill the jd/lat/lon columns
+        if records is None:
+            for result in results:
+                self.append(result)
+        else:
+            for result, rec in zip(results, records):
+                self.append(result, rec.jd(), rec.lat, rec.lon)
+
+    def close(self):
+        for col in self._cols.values():
+            col.flush()
+        meta = {
+            "version": STORE_VERSION,
+            "count": self.count,
+            "columns": {n: [d, list(s)] for n, (d, s) in STORE_COLUMNS.items()},
+            "bodies": PLANET_ORDER,
+            "sphutas": KN_SPHUTAS,
+            "panchanga": list(PANCHANGA_FIELDS),
+        }
+        tmp = _meta_file(self.path) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp, _meta_file(self.path))
+        self._cols = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ChartStore:
+    # Read-only view over a store directory; columns are memory-mapped lazily
+    def __init__(self, path):
+        self.path = str(path)
+        with open(_meta_file(self.path), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != STORE_VERSION:
+            raise ValueError("unsupported chart store version: " + str(self.meta.get("version")))
+        self.count = self.meta["count"]
+        self.bodies = self.meta["bodies"]
+        self._cols = {}
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return name in self.meta["columns"]
+
+    def __getitem__(self, name):
+        col = self._cols.get(name)
+        if col is None:
+            if name not in self:
+                raise KeyError(name)
+            col = np.load(_column_file(self.path, name), mmap_mode="r")[:self.count]
+            self._cols[name] = col
+        return col
+
+    def body(self, name):
+        return self.bodies.index(name)
+
+    def row(self, i):
+        return {name: self[name][i] for name in self.meta["columns"]}
+
+def write_chart_store(path, results, records=None, capacity=1024):
+    with ChartStoreWriter(path, capacity) as writer:
+        writer.extend(results, records)
+    return ChartStore(path)
@@ -0,0 +1,151 @@
+import bisect
+import datetime
+from typing import NamedTuple
+
+import numpy as np
+
+from .constants import YEARS
+
+YEAR_DAYS = 365.25
+KN_DASHA_LEVELS = ["ಮಹಾದಶೆ", "ಅಂತರ್ದಶೆ", "ಪ್ರತ್ಯಂತರ್ದಶೆ", "ಸೂಕ್ಷ್ಮದಶೆ", "ಪ್ರಾಣದಶೆ"]
+
+class DashaPeriod(NamedTuple):
+    lords: tuple
+    start: datetime.datetime
+    end: datetime.datetime
+    years: float
+
+    @property
+    def lord(self):
+        return self.lords[-1]
+
+    @property
+    def level(self):
+        return len(self.lords)
+
+def _chain(start, lords_prefix, first, durations):
+    # Consecutive periods starting at `start`; dates accumulate the same way the
+    # Dasha tab always has, one timedelta per period
+    cur = start
+    for k, years in enumerate(durations):
+        end = cur + datetime.timedelta(days=years * YEAR_DAYS)
+        yield DashaPeriod(lords_prefix + ((first + k) % 9,), cur, end, years)
+        cur = end
+
+def maha_dashas(date_obj, n_idx, perc):
+    # Nine Mahadashas from birth; the first is only the unexpired balance, and
+    # every sub-period inside it is scaled by the same (1 - perc)
+    si = n_idx % 9
+    durations = [YEARS[(si + i) % 9] * ((1 - perc) if i == 0 else 1) for i in range(9)]
+    return _chain(date_obj, (), si, durations)
+
+def sub_periods(period):
+    lord = period.lord
+    durations = [period.years * YEARS[(lord + k) % 9] / 120.0 for k in range(9)]
+    return _chain(period.start, period.lords, lord, durations)
+
+def dasha_at(date_obj, n_idx, perc, when, depth=3):
+    # Running period at every level down to `depth` (1 = Mahadasha ... 5 = Prana),
+    # found by bisecting the nine boundaries of each level in turn
+    path = []
+    level = list(maha_dashas(date_obj, n_idx, perc))
+    for _ in range(depth):
+        ends = [p.end for p in level]
+        i = bisect.bisect_right(ends, when)
+        if i >= len(level) or when < level[0].start:
+            return path
+        path.append(level[i])
+        level = list(sub_periods(level[i]))
+    return path
+
+def walk(date_obj, n_idx, perc, depth=3):
+    # Depth-first generator over the whole tree, one period at a time
+    stack = [iter(maha_dashas(date_obj, n_idx, perc))]
+    while stack:
+        period = next(stack[-1], None)
+        if period is None:
+            stack.pop()
+            continue
+        yield period
+        if period.level < depth:
+            stack.append(iter(sub_periods(period)))
+
+# ------------------------------------------------------------------
+# Vectorised timeline over many charts. Times are float days since the
+# Unix epoch (jd - 2440587.5 gives UT); births and query dates only
+# need to share the same clock.
+# ------------------------------------------------------------------
+UNIX_EPOCH_JD = 2440587.5
+_YEARS_ARR = np.array(YEARS, dtype=float)
+
+class DashaState(NamedTuple):
+    md_lord: np.ndarray
+    md_start: np.ndarray
+    md_end: np.ndarray
+    ad_lord: np.ndarray
+    ad_start: np.ndarray
+    ad_end: np.ndarray
+    next_ad_lord: np.ndarray
+
+def to_days(values):
+    arr = np.asarray(values)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype("datetime64[us]").astype(np.int64) / 86400e6
+    if arr.dtype == object:
+        return np.array([
+            (v - datetime.datetime(1970, 1, 1)).total_seconds() / 86400.0 for v in arr.ravel()
+        ]).reshape(arr.shape)
+    return arr.astype(float)
+
+def jd_to_days(jd):
+    return np.asarray(jd, dtype=float) - UNIX_EPOCH_JD
+
+def days_to_datetime64(days):
+    return (np.asarray(days) * 86400e6).astype(np.int64).astype("datetime64[us]")
+
+def moon_dasha_seed(moon_deg):
+    # Nakshatra index and elapsed fraction, as get_full_calculations derives them
+    moon_deg = np.asarray(moon_deg, dtype=float) % 360
+    n_idx = (moon_deg / 13.333333333).astype(np.int64)
+    perc = (moon_deg % 13.333333333) / 13.333333333
+    return n_idx, perc
+
+def dasha_state(birth_days, n_idx, perc, when):
+    # Active Mahadasha/Antardasha for N charts at `when` (scalar or (N,) days).
+    # Only the nine Mahadasha boundaries and the nine Antardashas of the
+    # running Mahadasha are formed per chart.
+    birth = np.asarray(birth_days, dtype=float)
+    perc = np.asarray(perc, dtype=float)
+    when = np.broadcast_to(np.asarray(when, dtype=float), birth.shape)
+    si = np.asarray(n_idx, dtype=np.int64) % 9
+    rows = np.arange(birth.shape[0])
+
+    md_lords = (si[:, None] + np.arange(9)) % 9
+    scale = np.ones((birth.shape[0], 9))
+    scale[:, 0] = 1 - perc
+    md_years = _YEARS_ARR[md_lords] * scale
+    md_ends = birth[:, None] + np.cumsum(md_years * YEAR_DAYS, axis=1)
+    mi = np.minimum((md_ends <= when[:, None]).sum(axis=1), 8)
+    md_end = md_ends[rows, mi]
+    md_start = np.where(mi == 0, birth, md_ends[rows, np.maximum(mi - 1, 0)])
+    md_lord = md_lords[rows, mi]
+
+    ad_lords = (md_lord[:, None] + np.arange(9)) % 9
+    ad_years = md_years[rows, mi][:, None] * _YEARS_ARR[ad_lords] / 120.0
+    ad_ends = md_start[:, None] + np.cumsum(ad_years * YEAR_DAYS, axis=1)
+    ai = np.minimum((ad_ends <= when[:, None]).sum(axis=1), 8)
+    ad_end = ad_ends[rows, ai]
+    ad_start = np.where(ai == 0, md_start, ad_ends[rows, np.maximum(ai - 1, 0)])
+    ad_lord = ad_lords[rows, ai]
+    # After the last Antardasha the next Mahadasha opens with its own lord
+    next_ad_lord = np.where(ai == 8, (md_lord + 1) % 9, (ad_lord + 1) % 9)
+    return DashaState(md_lord, md_start, md_end, ad_lord, ad_start, ad_end, next_ad_lord)
+
+def antardasha_changes(birth_days, n_idx, perc, start, end):
+    # Charts whose next Antardasha begins in (start, end]: returns the chart
+    # indices, the new lords and the change times, in chart order
+    state = dasha_state(birth_days, n_idx, perc, start)
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    hit = np.nonzero((state.ad_end > start) & (state.ad_end <= end))[0]
+    return hit, state.next_ad_lord[hit], state.ad_end[hit]
@@ -0,0 +1,80 @@
+import collections
+import contextlib
+import threading
+
+import swisseph as swe
+
+class SiderealGate:
+    # swisseph keeps the sidereal mode in process-global state. Callers using
+    # the same ayanamsa may run together; a caller needing another mode waits
+    # until the current ones drain, and while it waits no new callers of the
+    # running mode are let in, so neither side starves.
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._mode = None
+        self._active = 0
+        self._waiting = collections.Counter()
+
+    def _others_waiting(self, mode):
+        return any(n for m, n in self._waiting.items() if m != mode)
+
+    def _can_enter(self, mode):
+        if self._active == 0:
+            return True
+        return self._mode == mode and not self._others_waiting(mode)
+
+    @contextlib.contextmanager
+    def use(self, ayan_mode):
+        with self._cond:
+            self._waiting[ayan_mode] += 1
+            try:
+                self._cond.wait_for(lambda: self._can_enter(ayan_mode))
+            finally:
+                self._waiting[ayan_mode] -= 1
+                if not self._waiting[ayan_mode]:
+                    del self._waiting[ayan_mode]
+            # Set on every entry: with a thread-local build each thread has its own copy
+            swe.set_sid_mode(ayan_mode)
+            self._mode = ayan_mode
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                if self._active == 0:
+                    self._cond.notify_all()
+
+sidereal_gate = SiderealGate()
+_thread_local_state = None
+_probe_lock = threading.Lock()
+
+def _probe_thread_local_state():
+    # Some pyswisseph builds compile the C library with thread-local storage;
+    # then set_sid_mode in one thread is invisible to the others.
+    jd = 2451545.0
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    main_val = swe.get_ayanamsa(jd)
+
+    def probe():
+        swe.set_sid_mode(swe.SIDM_FAGAN_BRADLEY)
+
+    t = threading.Thread(target=probe)
+    t.start()
+    t.join()
+    return swe.get_ayanamsa(jd) == main_val
+
+@contextlib.contextmanager
+def _thread_local_mode(ayan_mode):
+    swe.set_sid_mode(ayan_mode)
+    yield
+
+def sidereal_mode(ayan_mode):
+    global _thread_local_state
+    if _thread_local_state is None:
+        with _probe_lock:
+            if _thread_local_state is None:
+                _thread_local_state = _probe_thread_local_state()
+    if _thread_local_state:
+        return _thread_local_mode(ayan_mode)
+    return sidereal_gate.use(ayan_mode)
@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import swisseph as swe
+
+from .ephe import sidereal_mode
+
+# Sidereal longitude and speed of each body on a regular UT grid, read back
+# with cubic Hermite interpolation (value + speed at both ends of the step).
+# With the default 1-day step the interpolation itself costs at most about
+# 0.6" for the Moon, 0.35" for the true node and well under 0.1" for the
+# other bodies. Without .se1 files swisseph falls back to the Moshier
+# series, whose Mercury/Jupiter/Saturn tracks have small kinks of their own;
+# the table smooths over those, so against that live fallback the worst
+# difference is a few arcseconds. ERROR_BOUND_ARCSEC covers both cases
+# (tests/test_ephemeris_table.py checks it against live swisseph).
+TABLE_BODIES = (0, 1, 2, 3, 4, 5, 6, swe.MEAN_NODE, swe.TRUE_NODE)
+ERROR_BOUND_ARCSEC = 5.0
+
+class EphemerisTable:
+    def __init__(self, data, start_jd, step, bodies, ayan_mode):
+        # data: (T, B, 2) float64 of [longitude, speed] per grid point and body
+        self.data = data
+        self.start_jd = float(start_jd)
+        self.step = float(step)
+        self.bodies = tuple(bodies)
+        self.ayan_mode = int(ayan_mode)
+        self._col = {b: i for i, b in enumerate(self.bodies)}
+
+    @property
+    def end_jd(self):
+        return self.start_jd + (self.data.shape[0] - 1) * self.step
+
+    def save(self, path):
+        path = str(path)
+        np.save(path, np.ascontiguousarray(self.data))
+        meta = {"start_jd": self.start_jd, "step": self.step,
+                "bodies": list(self.bodies), "ayan_mode": self.ayan_mode}
+        with open(_meta_path(path), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        path = str(path)
+        with open(_meta_path(path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        data = np.load(_npy_path(path), mmap_mode="r" if mmap else None)
+        return cls(data, meta["start_jd"], meta["step"], meta["bodies"], meta["ayan_mode"])
+
+    def positions(self, jd, bodies=None):
+        # Returns (longitude, speed), each shaped jd.shape + (len(bodies),)
+        jd = np.asarray(jd, dtype=float)
+        cols = [self._col[b] for b in (bodies if bodies is not None else self.bodies)]
+        pos = (jd - self.start_jd) / self.step
+        if np.any(pos < 0) or np.any(pos > self.data.shape[0] - 1):
+            raise ValueError("jd outside the table range %.1f-%.1f" % (self.start_jd, self.end_jd))
+        i0 = np.minimum(pos.astype(np.int64), self.data.shape[0] - 2)
+        s = (pos - i0)[..., None]
+        a = self.data[i0][..., cols, :]
+        b = self.data[i0 + 1][..., cols, :]
+        x0, v0 = a[..., 0], a[..., 1]
+        v1 = b[..., 1]
+        dx = (b[..., 0] - x0 + 180) % 360 - 180
+        h = self.step
+        s2 = s * s
+        s3 = s2 * s
+        lon = x0 + (s3 - 2 * s2 + s) * h * v0 + (-2 * s3 + 3 * s2) * dx + (s3 - s2) * h * v1
+        speed = (6 * s2 - 6 * s) * dx / h + (3 * s2 - 4 * s + 1) * v0 + (3 * s2 - 2 * s) * v1
+        return lon % 360, speed
+
+    def longitude(self, jd, body):
+        lon, _ = self.positions(jd, [body])
+        return lon[..., 0]
+
+def _npy_path(path):
+    return path if path.endswith(".npy") else path + ".npy"
+
+def _meta_path(path):
+    return _npy_path(path)[:-4] + ".json"
+
+def build_ephemeris_table(start_year=1800, end_year=2100, step=1.0,
+                          ayan_mode=swe.SIDM_LAHIRI, bodies=TABLE_BODIES):
+    start_jd = swe.julday(start_year, 1, 1, 0.0)
+    end_jd = swe.julday(end_year + 1, 1, 1, 0.0)
+    n = int(round((end_jd - start_jd) / step)) + 1
+    data = np.empty((n, len(bodies), 2), dtype=np.float64)
+    flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+    with sidereal_mode(ayan_mode):
+        for i in range(n):
+            jd = start_jd + i * step
+            for j, body in enumerate(bodies):
+                res = swe.calc_ut(jd, body, flag)[0]
+                data[i, j, 0] = res[0]
+                data[i, j, 1] = res[3]
+    return EphemerisTable(data, start_jd, step, bodies, ayan_mode)
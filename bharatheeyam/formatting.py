@@ -0,0 +1,23 @@
+def fmt_ghati(decimal_val):
+    g = int(decimal_val)
+    rem = decimal_val - g
+    v = int(round(rem * 60))
+    if v == 60: 
+        g += 1
+        v = 0
+    return str(g) + "." + str(v).zfill(2)
+
+def fmt_deg(dec_deg):
+    rem = dec_deg % 30
+    t_sec = int(round(rem * 3600))
+    dg = int(t_sec / 3600)
+    mn = int((t_sec % 3600) / 60)
+    sc = int(t_sec % 60)
+    if dg == 30:
+        dg = 29
+        mn = 59
+        sc = 59
+    s_dg = str(dg)
+    s_mn = str(mn).zfill(2)
+    s_sc = str(sc).zfill(2)
+    return s_dg + "° " + s_mn + "' " + s_sc + '"'
@@ -0,0 +1,166 @@
+import bisect
+import csv
+import heapq
+import math
+import os
+from typing import NamedTuple
+
+BUNDLED_PLACES = os.path.join(os.path.dirname(__file__), "data", "places_in.csv")
+
+class Place(NamedTuple):
+    name: str
+    lat: float
+    lon: float
+    admin1: str = ""
+    country: str = "IN"
+    timezone: str = "Asia/Kolkata"
+    population: int = 0
+
+def normalize_name(text):
+    return " ".join(text.casefold().split())
+
+class Gazetteer:
+    # Offline place lookup. Names (and alternate names) go into a sorted key
+    # array, so a prefix is one bisect away; coordinates go into 1-degree grid
+    # cells for nearest-place queries.
+    def __init__(self, places=()):
+        self.places = []
+        self._exact = {}
+        self._keys = []
+        self._key_ids = []
+        self._cells = {}
+        self._dirty = False
+        self.extend(places)
+
+    def __len__(self):
+        return len(self.places)
+
+    def extend(self, places):
+        for place in places:
+            self.add(place)
+
+    def add(self, place, names=None):
+        idx = len(self.places)
+        self.places.append(place)
+        seen = set()
+        for n in (names or (place.name,)):
+            key = normalize_name(n)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            best = self._exact.get(key)
+            if best is None or place.population > self.places[best].population:
+                self._exact[key] = idx
+            self._keys.append(key)
+            self._key_ids.append(idx)
+        cell = (math.floor(place.lat), math.floor(place.lon))
+        self._cells.setdefault(cell, []).append(idx)
+        self._dirty = True
+
+    def _index(self):
+        if self._dirty:
+            order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+            self._keys = [self._keys[i] for i in order]
+            self._key_ids = [self._key_ids[i] for i in order]
+            self._dirty = False
+
+    def lookup(self, name):
+        idx = self._exact.get(normalize_name(name))
+        if idx is not None:
+            return self.places[idx]
+        hits = self.complete(name, limit=1)
+        return hits[0] if hits else None
+
+    def complete(self, prefix, limit=10, max_scan=5000):
+        # Matches ranked by population; very wide prefixes ("b") only look
+        # at the first max_scan keys so the call stays bounded.
+        self._index()
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + "\U0010ffff", lo)
+        ids = []
+        seen = set()
+        for i in range(lo, min(hi, lo + max_scan)):
+            pid = self._key_ids[i]
+            if pid not in seen:
+                seen.add(pid)
+                ids.append(pid)
+        best = heapq.nlargest(limit, ids, key=lambda i: self.places[i].population)
+        return [self.places[i] for i in best]
+
+    def nearest(self, lat, lon, max_km=50.0):
+        best, best_km = None, max_km
+        reach = int(max_km / 111.0) + 1
+        c_lat, c_lon = math.floor(lat), math.floor(lon)
+        for dlat in range(-reach, reach + 1):
+            for dlon in range(-reach, reach + 1):
+                for idx in self._cells.get((c_lat + dlat, c_lon + dlon), ()):
+                    p = self.places[idx]
+                    km = haversine_km(lat, lon, p.lat, p.lon)
+                    if km <= best_km:
+                        best, best_km = p, km
+        return best
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(min(1.0, a)))
+
+def _csv_names(row):
+    alts = [a for a in (row.get("alt_names") or "").split("|") if a]
+    return [row["name"]] + alts
+
+def read_places_csv(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            place = Place(
+                row["name"], float(row["lat"]), float(row["lon"]),
+                row.get("admin1", ""), row.get("country") or "IN",
+                row.get("timezone") or "Asia/Kolkata", int(row.get("population") or 0),
+            )
+            yield place, _csv_names(row)
+
+def read_admin1_codes(path):
+    # GeoNames admin1CodesASCII.txt: "IN.19<TAB>Karnataka<TAB>..." -> {"IN.19": "Karnataka"}
+    names = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) >= 2:
+                names[cols[0]] = cols[1]
+    return names
+
+def read_geonames(path, feature_classes=("P",), admin1_names=None):
+    # GeoNames dump (IN.txt, cities500.txt, ...): tab-separated, 19 columns.
+    # Column 10 is only the admin1 code ("19"); it is turned into a state
+    # name through admin1CodesASCII.txt, passed in or found beside the dump,
+    # and left empty when there is no such file.
+    if admin1_names is None:
+        codes = os.path.join(os.path.dirname(os.path.abspath(path)), "admin1CodesASCII.txt")
+        admin1_names = read_admin1_codes(codes) if os.path.exists(codes) else {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 19 or cols[6] not in feature_classes:
+                continue
+            admin1 = admin1_names.get(cols[8] + "." + cols[10], "")
+            place = Place(
+                cols[1], float(cols[4]), float(cols[5]), admin1, cols[8],
+                cols[17] or "Asia/Kolkata", int(cols[14] or 0),
+            )
+            names = [cols[1], cols[2]] + [a for a in cols[3].split(",") if a]
+            yield place, names
+
+def load_gazetteer(paths=None):
+    gaz = Gazetteer()
+    for path in (paths or [BUNDLED_PLACES]):
+        path = str(path)
+        reader = read_places_csv if path.endswith(".csv") else read_geonames
+        for place, names in reader(path):
+            gaz.add(place, names)
+    gaz._index()
+    return gaz
@@ -0,0 +1,66 @@
+from typing import NamedTuple
+
+import numpy as np
+import swisseph as swe
+
+from .constants import Planet
+from .ephe import sidereal_mode
+
+# Transiting grahas in BAV_TARGETS order, as swisseph bodies
+GOCHARA_BODIES = (swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN)
+_MOON, _SATURN = 1, 6
+
+class GocharaScores(NamedTuple):
+    # (N charts, D days, 7 grahas): natal BAV / SAV bindus of the rashi each
+    # graha is transiting
+    bav: np.ndarray
+    sav: np.ndarray
+    # (N, D) sum of the BAV bindus over the seven grahas
+    total: np.ndarray
+    # (N, D) transit Moon in the 8th from the natal Moon
+    chandrashtama: np.ndarray
+    # (N, D) 0 = none, 1 = Saturn 12th from the natal Moon, 2 = over it, 3 = 2nd
+    sade_sati: np.ndarray
+
+def transit_rashis(jds, ayan_mode=swe.SIDM_LAHIRI, table=None):
+    # (D, 7) sidereal rashi of each graha at each jd; one ephemeris pass that
+    # every chart shares. An EphemerisTable built for ayan_mode avoids the
+    # live calls altogether.
+    jds = np.atleast_1d(np.asarray(jds, dtype=float))
+    if table is not None:
+        if table.ayan_mode != ayan_mode:
+            raise ValueError("ephemeris table was built for another ayanamsa")
+        lon, _ = table.positions(jds, GOCHARA_BODIES)
+    else:
+        lon = np.empty((jds.shape[0], len(GOCHARA_BODIES)))
+        flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+        with sidereal_mode(ayan_mode):
+            for i, jd in enumerate(jds):
+                for j, body in enumerate(GOCHARA_BODIES):
+                    lon[i, j] = swe.calc_ut(jd, body, flag)[0][0]
+    return (lon % 360 // 30).astype(np.int64)
+
+def gochara_scores(natal_bav, natal_sav, natal_moon_rashi, transit):
+    # natal_bav (N, 7, 12), natal_sav (N, 12), natal_moon_rashi (N,),
+    # transit (D, 7) from transit_rashis
+    natal_bav = np.asarray(natal_bav)
+    natal_sav = np.asarray(natal_sav)
+    moon = np.asarray(natal_moon_rashi, dtype=np.int64)[:, None]
+    transit = np.asarray(transit, dtype=np.int64)
+    grahas = np.arange(transit.shape[1])
+
+    bav = natal_bav[:, grahas, transit]
+    sav = natal_sav[:, transit]
+    total = bav.sum(axis=2, dtype=np.int16)
+
+    moon_house = (transit[None, :, _MOON] - moon) % 12
+    sat_house = (transit[None, :, _SATURN] - moon) % 12
+    chandrashtama = moon_house == 7
+    sade_sati = np.select([sat_house == 11, sat_house == 0, sat_house == 1], [1, 2, 3], 0).astype(np.int8)
+    return GocharaScores(bav, sav, total, chandrashtama, sade_sati)
+
+def gochara_from_store(store, jds, ayan_mode=swe.SIDM_LAHIRI, table=None):
+    # Scores every chart in a ChartStore against the transits at jds
+    moon = (np.asarray(store["longitude"][:, Planet.CHANDRA]) // 30).astype(np.int64)
+    transit = transit_rashis(jds, ayan_mode, table)
+    return gochara_scores(store["bav"], store["sav"], moon, transit)
@@ -0,0 +1,113 @@
+import math
+from typing import NamedTuple
+
+import swisseph as swe
+
+from .ephe import sidereal_mode
+from .lru import LRUCache
+from .solar import SIDEREAL_RATE
+
+class LagnaChange(NamedTuple):
+    jd: float
+    # 1 for a lagna rashi ingress, 9 for a navamsa change
+    division: int
+    # New rashi (0 = Mesha) of the lagna in that division
+    index: int
+
+lagna_cache = LRUCache(maxsize=1024)
+
+def lagna_longitude(jd, lat, lon):
+    # Sidereal ascendant, as get_full_calculations takes it; caller holds sidereal_mode()
+    return (swe.houses(jd, float(lat), float(lon), b'P')[1][0] - swe.get_ayanamsa(jd)) % 360
+
+def _rising_lst(lam, eps, lat):
+    # Local sidereal time (degrees) at which tropical ecliptic longitude lam
+    # rises, or None where that point never rises at this latitude
+    l, e, p = math.radians(lam), math.radians(eps), math.radians(lat)
+    ra = math.atan2(math.cos(e) * math.sin(l), math.cos(l))
+    dec = math.asin(math.sin(e) * math.sin(l))
+    cos_h0 = -math.tan(p) * math.tan(dec)
+    if abs(cos_h0) > 1:
+        return None
+    return math.degrees(ra - math.acos(cos_h0)) % 360
+
+def _asc_rate(lst, eps, lat):
+    # d(ascendant)/d(local sidereal time), from tan Asc = cos R / -(sin R cos e + tan p sin e)
+    r, e, p = math.radians(lst), math.radians(eps), math.radians(lat)
+    y = math.cos(r)
+    x = -(math.sin(r) * math.cos(e) + math.tan(p) * math.sin(e))
+    dy = -math.sin(r)
+    dx = -math.cos(r) * math.cos(e)
+    return (x * dy - y * dx) / (x * x + y * y)
+
+def _chunk(start, end, lat, lon, divisions, out):
+    # Boundaries in [start, end) for a span short enough that obliquity and
+    # ayanamsa can be taken once, at its middle
+    mid = 0.5 * (start + end)
+    eps = swe.calc_ut(mid, swe.ECL_NUT)[0][0]
+    ayan = swe.get_ayanamsa(mid)
+    # Estimates start a little early so a boundary the correction moves
+    # across the chunk edge is still seen by the chunk that owns it
+    t0 = start - 0.01
+    lst0 = swe.sidtime(t0) * 15.0 + lon
+    for division in divisions:
+        span = 30.0 / division
+        for k in range(12 * division):
+            target = k * span
+            lst = _rising_lst(target + ayan, eps, lat)
+            if lst is None:
+                continue
+            t = t0 + ((lst - lst0) % 360) / SIDEREAL_RATE
+            while t < end:
+                # One house call corrects for the drift of the sidereal-time
+                # model, obliquity and ayanamsa over the chunk
+                diff = (lagna_longitude(t, lat, lon) - target + 180) % 360 - 180
+                rate = _asc_rate((swe.sidtime(t) * 15.0 + lon) % 360, eps, lat) * SIDEREAL_RATE
+                if rate > 0:
+                    t -= diff / rate
+                if start <= t < end:
+                    out.append(LagnaChange(t, division, k % 12))
+                t += 360.0 / SIDEREAL_RATE
+
+def _timetable(start_jd, end_jd, lat, lon, divisions):
+    out = []
+    t = start_jd
+    while t < end_jd:
+        nxt = min(t + 1.0, end_jd)
+        _chunk(t, nxt, float(lat), float(lon), divisions, out)
+        t = nxt
+    out.sort()
+    return out
+
+def lagna_timetable(start_jd, end_jd, lat, lon, ayan_mode=swe.SIDM_LAHIRI, divisions=(1, 9)):
+    # Every lagna rashi ingress (division 1) and navamsa change (division 9)
+    # in [start_jd, end_jd), found from the sidereal time at which each
+    # boundary rises and refined with a single swe.houses call
+    with sidereal_mode(ayan_mode):
+        return _timetable(start_jd, end_jd, lat, lon, divisions)
+
+def lagna_intervals(windows, lat, lon, allowed, ayan_mode=swe.SIDM_LAHIRI):
+    # Parts of the given (start, end) windows whose lagna rashi is allowed
+    allowed = set(allowed)
+    out = []
+    with sidereal_mode(ayan_mode):
+        for start, end in windows:
+            rashi = int(lagna_longitude(start, lat, lon) // 30)
+            seg = start
+            for change in _timetable(start, end, lat, lon, (1,)) + [LagnaChange(end, 1, -1)]:
+                if rashi in allowed and change.jd > seg:
+                    if out and out[-1][1] >= seg:
+                        out[-1] = (out[-1][0], change.jd)
+                    else:
+                        out.append((seg, change.jd))
+                seg, rashi = change.jd, change.index
+    return out
+
+def lagna_day(jd_start, lat, lon, ayan_mode=swe.SIDM_LAHIRI, divisions=(1, 9)):
+    # Cached one-day table; jd is rounded to the second and place to ~100 m
+    key = (round(jd_start, 5), round(float(lat), 3), round(float(lon), 3), int(ayan_mode), tuple(divisions))
+    table = lagna_cache.get(key)
+    if table is None:
+        table = lagna_timetable(jd_start, jd_start + 1.0, lat, lon, ayan_mode, divisions)
+        lagna_cache.put(key, table)
+    return table
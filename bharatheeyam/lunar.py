@@ -0,0 +1,60 @@
+import swisseph as swe
+
+from .errors import ChartError
+
+NAK_SPAN = 13.333333333
+
+def moon_angle(jd):
+    ayan = swe.get_ayanamsa(jd)
+    res = swe.calc_ut(jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SPEED)
+    return (res[0][0] - ayan) % 360, res[0][3]
+
+def elongation_angle(jd):
+    m = swe.calc_ut(jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+    s = swe.calc_ut(jd, swe.SUN, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+    return (m[0] - s[0]) % 360, m[3] - s[3]
+
+def yoga_angle(jd):
+    ayan = swe.get_ayanamsa(jd)
+    m = swe.calc_ut(jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+    s = swe.calc_ut(jd, swe.SUN, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+    return (m[0] + s[0] - 2 * ayan) % 360, m[3] + s[3]
+
+# limb -> (angle function, span of one division in degrees)
+LIMBS = {
+    "nakshatra": (moon_angle, NAK_SPAN),
+    "tithi": (elongation_angle, 12.0),
+    "yoga": (yoga_angle, NAK_SPAN),
+    "karana": (elongation_angle, 6.0),
+}
+
+def find_angle_crossing(jd, angle_fn, target_deg, max_shift=1.2, max_iter=8, tol=1e-8):
+    # Newton on the wrapped angle difference; the rate comes straight from FLG_SPEED
+    t = jd
+    for _ in range(max_iter):
+        deg, speed = angle_fn(t)
+        if speed <= 0:
+            raise ChartError("ಕೋನದ ವೇಗ ಧನಾತ್ಮಕವಾಗಿಲ್ಲ (jd=" + str(t) + ")")
+        diff = (target_deg - deg + 180) % 360 - 180
+        dt = diff / speed
+        t += dt
+        if abs(t - jd) > max_shift:
+            raise ChartError("ಸೀಮೆ ±" + str(max_shift) + " ದಿನಗಳಲ್ಲಿ ಸಿಗಲಿಲ್ಲ (jd=" + str(jd) + ")")
+        if abs(dt) < tol:
+            return t
+    raise ChartError("ಸೀಮೆ ಗಣನೆ ಒಮ್ಮುಖವಾಗಲಿಲ್ಲ (jd=" + str(jd) + ")")
+
+def find_nak_limit(jd, target_deg):
+    return find_angle_crossing(jd, moon_angle, target_deg)
+
+def find_limb_limit(jd, limb, target_deg):
+    angle_fn, _ = LIMBS[limb]
+    return find_angle_crossing(jd, angle_fn, target_deg)
+
+def find_limb_bounds(jd, limb):
+    angle_fn, span = LIMBS[limb]
+    deg, _ = angle_fn(jd)
+    idx = int(deg / span)
+    start = find_angle_crossing(jd, angle_fn, idx * span)
+    end = find_angle_crossing(jd, angle_fn, ((idx + 1) * span) % 360)
+    return idx, start, end
@@ -0,0 +1,217 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .constants import Planet
+
+KN_KOOTAS = ["ವರ್ಣ", "ವಶ್ಯ", "ತಾರಾ", "ಯೋನಿ", "ಗ್ರಹಮೈತ್ರಿ", "ಗಣ", "ಭಕೂಟ", "ನಾಡಿ"]
+KOOTA_MAX = [1, 2, 3, 4, 5, 6, 7, 8]
+KN_PORUTHAMS = [
+    "ದಿನ", "ಗಣ", "ಮಾಹೇಂದ್ರ", "ಸ್ತ್ರೀದೀರ್ಘ", "ಯೋನಿ",
+    "ರಾಶಿ", "ರಾಶ್ಯಧಿಪತಿ", "ವಶ್ಯ", "ರಜ್ಜು", "ವೇಧ"
+]
+
+# --- Per-nakshatra attributes (0 = Ashwini) ---
+# Yoni animals: horse, elephant, sheep, serpent, dog, cat, rat, cow,
+# buffalo, tiger, deer, monkey, mongoose, lion
+_YONI = [0, 1, 2, 3, 3, 4, 5, 2, 5, 6, 6, 7, 8, 9, 8, 9, 10, 10, 4, 11, 12, 11, 13, 0, 13, 7, 1]
+_YONI_SCORE = np.array([
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4],
+])
+# Gana: 0 = deva, 1 = manushya, 2 = rakshasa
+_GANA = [0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2, 0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0]
+# [boy gana, girl gana]
+_GANA_SCORE = np.array([[6, 6, 0], [5, 6, 0], [1, 0, 6]])
+# Nadi (adi, madhya, antya) and rajju (pada ... siro) repeat along the nakshatras
+_NADI = [(0, 1, 2, 2, 1, 0)[n % 6] for n in range(27)]
+_RAJJU = [(0, 1, 2, 3, 4, 3, 2, 1, 0)[n % 9] for n in range(27)]
+_VEDHA = {
+    (0, 17), (1, 16), (2, 15), (3, 14), (5, 21), (6, 20), (7, 19), (8, 18),
+    (9, 26), (10, 25), (11, 24), (12, 23), (4, 22), (13, 22), (4, 13),
+}
+
+# --- Per-rashi attributes (0 = Mesha) ---
+# Varna rank: 3 = brahmana ... 0 = shudra
+_VARNA = [2, 1, 0, 3, 2, 1, 0, 3, 2, 1, 0, 3]
+# Vashya: 0 = chatushpada, 1 = manava, 2 = jalachara, 3 = vanachara, 4 = keeta
+_VASHYA = [0, 0, 1, 2, 3, 1, 1, 4, 1, 2, 1, 2]
+_VASHYA_SCORE = np.array([
+    [2, 1, 1, 0.5, 1],
+    [1, 2, 0.5, 0, 1],
+    [1, 0.5, 2, 1, 1],
+    [0.5, 0, 1, 2, 0],
+    [1, 1, 1, 0, 2],
+])
+# Rashi lords as 0 = Sun ... 6 = Saturn
+_RASHI_LORD = [2, 5, 3, 1, 0, 3, 5, 2, 4, 6, 6, 4]
+# Natural relationship of a graha towards another: 2 friend, 1 neutral, 0 enemy
+_RELATION = np.array([
+    [2, 2, 2, 1, 2, 0, 0],
+    [2, 2, 1, 2, 1, 1, 1],
+    [2, 2, 2, 0, 2, 1, 1],
+    [2, 0, 1, 2, 1, 2, 1],
+    [2, 2, 2, 0, 2, 0, 1],
+    [0, 0, 1, 2, 1, 2, 2],
+    [0, 0, 0, 2, 1, 2, 2],
+])
+# Graha maitri by (relation one way, relation the other way)
+_MAITRI_SCORE = {
+    (2, 2): 5, (2, 1): 4, (1, 2): 4, (1, 1): 3,
+    (2, 0): 1, (0, 2): 1, (1, 0): 0.5, (0, 1): 0.5, (0, 0): 0,
+}
+# Girl's rashi -> boy's rashis that are vashya to it
+_VASYA_PAIRS = {
+    0: (4, 7), 1: (3, 6), 2: (5,), 3: (7, 8), 4: (6,), 5: (11, 2),
+    6: (5, 9), 7: (3,), 8: (11,), 9: (0, 10), 10: (0,), 11: (9,),
+}
+
+def _count(frm, to, n):
+    # Inclusive count from one index to another, 1..n
+    return (to - frm) % n + 1
+
+def _tara_ok(frm, to):
+    return _count(frm, to, 27) % 9 not in (3, 5, 7)
+
+def _build_tables():
+    nak = np.zeros((4, 27, 27))
+    por_nak = np.zeros((7, 27, 27), dtype=bool)
+    for b in range(27):
+        for g in range(27):
+            c = _count(g, b, 27)
+            nak[0, b, g] = 1.5 * _tara_ok(g, b) + 1.5 * _tara_ok(b, g)
+            nak[1, b, g] = _YONI_SCORE[_YONI[b], _YONI[g]]
+            nak[2, b, g] = _GANA_SCORE[_GANA[b], _GANA[g]]
+            nak[3, b, g] = 0 if _NADI[b] == _NADI[g] else 8
+            por_nak[0, b, g] = c % 9 in (0, 2, 4, 6, 8)
+            por_nak[1, b, g] = _GANA[b] == _GANA[g] or {_GANA[b], _GANA[g]} == {0, 1}
+            por_nak[2, b, g] = c in (4, 7, 10, 13, 16, 19, 22, 25)
+            por_nak[3, b, g] = c > 13
+            por_nak[4, b, g] = nak[1, b, g] >= 2
+            por_nak[5, b, g] = _RAJJU[b] != _RAJJU[g]
+            por_nak[6, b, g] = (min(b, g), max(b, g)) not in _VEDHA
+
+    rashi = np.zeros((4, 12, 12))
+    por_rashi = np.zeros((3, 12, 12), dtype=bool)
+    for b in range(12):
+        for g in range(12):
+            lb, lg = _RASHI_LORD[b], _RASHI_LORD[g]
+            rel = (int(_RELATION[lb, lg]), int(_RELATION[lg, lb]))
+            c = _count(g, b, 12)
+            rashi[0, b, g] = 1 if _VARNA[b] >= _VARNA[g] else 0
+            rashi[1, b, g] = _VASHYA_SCORE[_VASHYA[b], _VASHYA[g]]
+            rashi[2, b, g] = 5 if lb == lg else _MAITRI_SCORE[rel]
+            rashi[3, b, g] = 0 if c in (2, 12, 5, 9, 6, 8) else 7
+            por_rashi[0, b, g] = c == 1 or (c >= 7 and c != 8)
+            por_rashi[1, b, g] = lb == lg or 0 not in rel
+            por_rashi[2, b, g] = b in _VASYA_PAIRS[g] or g in _VASYA_PAIRS[b]
+    return nak, rashi, por_nak, por_rashi
+
+# Tables are indexed [boy, girl]. Nakshatra kootas: tara, yoni, gana, nadi;
+# rashi kootas: varna, vashya, graha maitri, bhakoot. Poruthams: dina, gana,
+# mahendra, stree deergha, yoni, rajju, vedha by nakshatra; rashi,
+# rashyadhipati, vashya by rashi.
+KOOTA_NAK, KOOTA_RASHI, PORUTHAM_NAK, PORUTHAM_RASHI = _build_tables()
+ASHTAKOOTA_NAK = KOOTA_NAK.sum(axis=0)
+ASHTAKOOTA_RASHI = KOOTA_RASHI.sum(axis=0)
+PORUTHAM_COUNT_NAK = PORUTHAM_NAK.sum(axis=0).astype(np.int8)
+PORUTHAM_COUNT_RASHI = PORUTHAM_RASHI.sum(axis=0).astype(np.int8)
+RAJJU_OK = PORUTHAM_NAK[5]
+for _t in (KOOTA_NAK, KOOTA_RASHI, PORUTHAM_NAK, PORUTHAM_RASHI, ASHTAKOOTA_NAK,
+           ASHTAKOOTA_RASHI, PORUTHAM_COUNT_NAK, PORUTHAM_COUNT_RASHI):
+    _t.setflags(write=False)
+
+def ashtakoota(boy_nak, boy_rashi, girl_nak, girl_rashi):
+    # Guna milan out of 36, koota by koota in KN_KOOTAS order
+    n = KOOTA_NAK[:, boy_nak, girl_nak]
+    r = KOOTA_RASHI[:, boy_rashi, girl_rashi]
+    scores = [r[0], r[1], n[0], n[1], r[2], n[2], r[3], n[3]]
+    return dict(zip(KN_KOOTAS, (float(s) for s in scores)))
+
+def porutham(boy_nak, boy_rashi, girl_nak, girl_rashi):
+    n = PORUTHAM_NAK[:, boy_nak, girl_nak]
+    r = PORUTHAM_RASHI[:, boy_rashi, girl_rashi]
+    passed = [n[0], n[1], n[2], n[3], n[4], r[0], r[1], r[2], n[5], n[6]]
+    return dict(zip(KN_PORUTHAMS, (bool(p) for p in passed)))
+
+def kuja_dosha(longitudes):
+    # Mars in the 1st, 2nd, 4th, 7th, 8th or 12th from the lagna; longitudes
+    # is (N, 11) in Planet order, as ChartStore["longitude"] holds them
+    lon = np.asarray(longitudes, dtype=float)
+    house = ((lon[..., Planet.KUJA] // 30) - (lon[..., Planet.LAGNA] // 30)) % 12 + 1
+    return np.isin(house, (1, 2, 4, 7, 8, 12))
+
+def sav_seventh(sav, longitudes):
+    # SAV bindus of the 7th house from the lagna
+    lagna = (np.asarray(longitudes, dtype=float)[..., Planet.LAGNA] // 30).astype(np.int64)
+    sav = np.asarray(sav)
+    return sav[np.arange(sav.shape[0]), (lagna + 6) % 12]
+
+class MatchPool(NamedTuple):
+    nak: np.ndarray
+    rashi: np.ndarray
+    kuja: np.ndarray = None
+    sav7: np.ndarray = None
+
+def pool_from_store(store):
+    lon = store["longitude"]
+    moon = np.asarray(lon[:, Planet.CHANDRA])
+    nak = (moon / 13.333333333).astype(np.int64) % 27
+    return MatchPool(nak, (moon // 30).astype(np.int64), kuja_dosha(lon), sav_seventh(store["sav"], lon))
+
+class MatchResult(NamedTuple):
+    index: np.ndarray
+    ashtakoota: np.ndarray
+    porutham: np.ndarray
+    rajju_ok: np.ndarray
+
+def rank_matches(nak, rashi, pool, as_boy=True, top_k=20, system="ashtakoota",
+                 kuja=None, min_sav7=None, require_rajju=False):
+    # Scores one profile against every candidate with two table gathers and
+    # returns the top_k by the chosen system (ties broken by the other one).
+    # kuja: the profile's own Kuja dosha, to keep only candidates that match it.
+    cand_nak = np.asarray(pool.nak, dtype=np.int64)
+    cand_rashi = np.asarray(pool.rashi, dtype=np.int64)
+    if as_boy:
+        guna = ASHTAKOOTA_NAK[nak][cand_nak] + ASHTAKOOTA_RASHI[rashi][cand_rashi]
+        por = PORUTHAM_COUNT_NAK[nak][cand_nak] + PORUTHAM_COUNT_RASHI[rashi][cand_rashi]
+        rajju = RAJJU_OK[nak][cand_nak]
+    else:
+        guna = ASHTAKOOTA_NAK[:, nak][cand_nak] + ASHTAKOOTA_RASHI[:, rashi][cand_rashi]
+        por = PORUTHAM_COUNT_NAK[:, nak][cand_nak] + PORUTHAM_COUNT_RASHI[:, rashi][cand_rashi]
+        rajju = RAJJU_OK[:, nak][cand_nak]
+
+    keep = np.ones(cand_nak.shape[0], dtype=bool)
+    if kuja is not None and pool.kuja is not None:
+        keep &= np.asarray(pool.kuja) == bool(kuja)
+    if min_sav7 is not None and pool.sav7 is not None:
+        keep &= np.asarray(pool.sav7) >= min_sav7
+    if require_rajju:
+        keep &= rajju
+
+    if system == "ashtakoota":
+        key = guna * 16 + por
+    elif system == "porutham":
+        key = por * 64.0 + guna
+    else:
+        raise ValueError("unknown matching system: " + str(system))
+    key = np.where(keep, key, -np.inf)
+    k = min(top_k, int(keep.sum()))
+    if k == 0:
+        idx = np.empty(0, dtype=np.int64)
+    else:
+        idx = np.argpartition(-key, k - 1)[:k]
+        idx = idx[np.argsort(-key[idx], kind="stable")]
+    return MatchResult(idx, guna[idx], por[idx], rajju[idx])
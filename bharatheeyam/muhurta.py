@@ -0,0 +1,127 @@
+import datetime
+from typing import NamedTuple
+
+import swisseph as swe
+
+from .ephe import sidereal_mode
+from .lagna import lagna_intervals
+from .lunar import LIMBS, find_angle_crossing
+from .panchanga import LIMB_COUNTS, vara_index
+from .solar import sunrise_sunset
+
+# Eighth of the daytime that is Rahu kala, by vara (0 = Sunday)
+RAHU_KALA_PART = [8, 2, 7, 5, 6, 4, 3]
+
+class MuhurtaWindow(NamedTuple):
+    start: float
+    end: float
+
+    @property
+    def minutes(self):
+        return (self.end - self.start) * 1440.0
+
+# ------------------------------------------------------------------
+# Interval sets are sorted lists of disjoint (start, end) jd pairs
+# ------------------------------------------------------------------
+def _add(out, start, end):
+    if end <= start:
+        return
+    if out and start <= out[-1][1]:
+        out[-1] = (out[-1][0], max(out[-1][1], end))
+    else:
+        out.append((start, end))
+
+def intersect(a, b):
+    out = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        _add(out, max(a[i][0], b[j][0]), min(a[i][1], b[j][1]))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+def subtract(a, b):
+    out = []
+    j = 0
+    for start, end in a:
+        while j < len(b) and b[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(b) and b[k][0] < end:
+            _add(out, start, b[k][0])
+            start = max(start, b[k][1])
+            k += 1
+        _add(out, start, end)
+    return out
+
+# ------------------------------------------------------------------
+# Constraint interval builders
+# ------------------------------------------------------------------
+def limb_intervals(limb, start_jd, end_jd, allowed):
+    # Walks every boundary of the limb across the range, each Newton solve
+    # starting from the previous boundary. Caller holds sidereal_mode().
+    angle_fn, span = LIMBS[limb]
+    count = LIMB_COUNTS[limb]
+    allowed = set(allowed)
+    idx = int(angle_fn(start_jd)[0] / span) % count
+    t = start_jd
+    out = []
+    while t < end_jd:
+        nxt = find_angle_crossing(t, angle_fn, ((idx + 1) * span) % 360)
+        if idx in allowed:
+            _add(out, t, min(nxt, end_jd))
+        t, idx = nxt, (idx + 1) % count
+    return out
+
+def _solar_days(start_date, end_date, lat, lon):
+    # (date, sunrise, sunset) from the day before start_date to the day after end_date
+    day = start_date - datetime.timedelta(days=1)
+    out = []
+    while day <= end_date + datetime.timedelta(days=1):
+        sr, ss = sunrise_sunset(day.year, day.month, day.day, lat, lon)
+        out.append((day, sr, ss))
+        day += datetime.timedelta(days=1)
+    return out
+
+def vara_intervals(solar_days, allowed):
+    # A vara runs from its sunrise to the next sunrise
+    allowed = set(allowed)
+    out = []
+    for (day, sr, _), (_, nsr, _) in zip(solar_days, solar_days[1:]):
+        if vara_index(day) in allowed:
+            _add(out, sr, nsr)
+    return out
+
+def rahu_kala_intervals(solar_days):
+    out = []
+    for day, sr, ss in solar_days:
+        part = (ss - sr) / 8.0
+        k = RAHU_KALA_PART[vara_index(day)]
+        _add(out, sr + (k - 1) * part, sr + k * part)
+    return out
+
+def find_muhurtas(start_date, end_date, lat, lon, tithis=None, nakshatras=None, yogas=None,
+                  karanas=None, varas=None, lagnas=None, avoid_rahu_kala=True,
+                  min_minutes=0.0, ayan_mode=swe.SIDM_LAHIRI):
+    # Windows between the first sunrise and the last day's following sunrise
+    # that satisfy every given constraint (iterables of limb indices, varas
+    # with 0 = Sunday, lagna rashis with 0 = Mesha). Each constraint is an
+    # interval set solved at its boundaries; the expensive lagna set is only
+    # evaluated inside what the other constraints leave.
+    days = _solar_days(start_date, end_date, lat, lon)
+    windows = [(days[1][1], days[-1][1])]
+    if varas is not None:
+        windows = intersect(windows, vara_intervals(days, varas))
+    if avoid_rahu_kala:
+        windows = subtract(windows, rahu_kala_intervals(days))
+    with sidereal_mode(ayan_mode):
+        for limb, allowed in (("tithi", tithis), ("nakshatra", nakshatras),
+                              ("yoga", yogas), ("karana", karanas)):
+            if allowed is None or not windows:
+                continue
+            windows = intersect(windows, limb_intervals(limb, windows[0][0], windows[-1][1], allowed))
+    if lagnas is not None and windows:
+        windows = lagna_intervals(windows, lat, lon, lagnas, ayan_mode)
+    return [MuhurtaWindow(s, e) for s, e in windows if (e - s) * 1440.0 >= min_minutes]
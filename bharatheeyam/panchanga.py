@@ -0,0 +1,83 @@
+import datetime
+from typing import NamedTuple
+
+import swisseph as swe
+
+from .ephe import sidereal_mode
+from .lunar import LIMBS, find_angle_crossing
+from .solar import find_sunrise_set_for_date
+
+KN_KARANA_MOVABLE = ["ಬವ", "ಬಾಲವ", "ಕೌಲವ", "ತೈತಿಲ", "ಗರ", "ವಣಿಜ", "ಭದ್ರಾ (ವಿಷ್ಟಿ)"]
+
+# Number of divisions in a full circle for each limb
+LIMB_COUNTS = {"tithi": 30, "nakshatra": 27, "yoga": 27, "karana": 60}
+
+def karana_name(k_idx):
+    if k_idx == 0:
+        return "ಕಿಂಸ್ತುಘ್ನ"
+    elif k_idx == 57:
+        return "ಶಕುನಿ"
+    elif k_idx == 58:
+        return "ಚತುಷ್ಪಾದ"
+    elif k_idx == 59:
+        return "ನಾಗ"
+    return KN_KARANA_MOVABLE[(k_idx - 1) % 7]
+
+def vara_index(date):
+    # 0 = Sunday, as KN_VARA is ordered
+    return (date.weekday() + 1) % 7
+
+class PanchangaDay(NamedTuple):
+    date: datetime.date
+    sunrise: float
+    sunset: float
+    vara: int
+    # Each limb is a tuple of (index, end jd) pairs: the one running at sunrise
+    # followed by any that begin before the next sunrise
+    tithi: tuple
+    nakshatra: tuple
+    yoga: tuple
+    karana: tuple
+
+def _first_limb(limb, jd):
+    angle_fn, span = LIMBS[limb]
+    idx = int(angle_fn(jd)[0] / span) % LIMB_COUNTS[limb]
+    end = find_angle_crossing(jd, angle_fn, ((idx + 1) * span) % 360)
+    return idx, end
+
+def _limbs_until(limb, current, until):
+    # Extends from the running (idx, end) through every boundary before `until`;
+    # each step starts Newton at the boundary just found
+    angle_fn, span = LIMBS[limb]
+    count = LIMB_COUNTS[limb]
+    out = [current]
+    idx, end = current
+    while end <= until:
+        idx = (idx + 1) % count
+        end = find_angle_crossing(end, angle_fn, ((idx + 1) * span) % 360)
+        out.append((idx, end))
+    return out
+
+def panchanga_calendar(start_date, end_date, lat, lon, ayan_mode=swe.SIDM_LAHIRI):
+    # Streams one PanchangaDay per civil date in [start_date, end_date]. The
+    # next day's sunrise and every limb boundary already found are carried
+    # forward, so each solar event and boundary is solved exactly once.
+    one_day = datetime.timedelta(days=1)
+    day = start_date
+    sr, ss = find_sunrise_set_for_date(day.year, day.month, day.day, lat, lon)
+    running = {}
+    while day <= end_date:
+        nxt = day + one_day
+        sr_next, ss_next = find_sunrise_set_for_date(nxt.year, nxt.month, nxt.day, lat, lon)
+        with sidereal_mode(ayan_mode):
+            rows = {}
+            for limb in LIMB_COUNTS:
+                current = running.get(limb)
+                if current is None:
+                    current = _first_limb(limb, sr)
+                entries = _limbs_until(limb, current, sr_next)
+                running[limb] = entries[-1]
+                rows[limb] = tuple(entries)
+        yield PanchangaDay(day, sr, ss, vara_index(day), rows["tithi"],
+                           rows["nakshatra"], rows["yoga"], rows["karana"])
+        day, sr, ss = nxt, sr_next, ss_next
@@ -0,0 +1,227 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+PROFILE_FIELDS = ("d", "h", "m", "ampm", "lat", "lon", "p")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    d TEXT NOT NULL,
+    h INTEGER NOT NULL DEFAULT 12,
+    m INTEGER NOT NULL DEFAULT 0,
+    ampm TEXT NOT NULL DEFAULT 'AM',
+    lat REAL NOT NULL DEFAULT 14.98,
+    lon REAL NOT NULL DEFAULT 74.73,
+    p TEXT NOT NULL DEFAULT 'Yellapur',
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_d ON profiles(d);
+CREATE INDEX IF NOT EXISTS profiles_name_lower ON profiles(lower(name));
+CREATE INDEX IF NOT EXISTS profiles_p_lower ON profiles(lower(p));
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Trigram full-text index for substring search on name and place, kept in
+# step with the profiles table by triggers. Needs SQLite 3.34+ with FTS5.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE profiles_fts USING fts5(
+    name, p, content='profiles', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER profiles_fts_ai AFTER INSERT ON profiles BEGIN
+    INSERT INTO profiles_fts(rowid, name, p) VALUES (new.rowid, new.name, new.p);
+END;
+CREATE TRIGGER profiles_fts_ad AFTER DELETE ON profiles BEGIN
+    INSERT INTO profiles_fts(profiles_fts, rowid, name, p) VALUES ('delete', old.rowid, old.name, old.p);
+END;
+CREATE TRIGGER profiles_fts_au AFTER UPDATE ON profiles BEGIN
+    INSERT INTO profiles_fts(profiles_fts, rowid, name, p) VALUES ('delete', old.rowid, old.name, old.p);
+    INSERT INTO profiles_fts(rowid, name, p) VALUES (new.rowid, new.name, new.p);
+END;
+INSERT INTO profiles_fts(profiles_fts) VALUES ('rebuild');
+"""
+
+SEARCH_FIELDS = ("name", "p")
+
+class ProfilePage(NamedTuple):
+    rows: list
+    next_after: object
+
+def _prefix_upper(prefix):
+    # Smallest string greater than every string starting with prefix
+    return prefix + "\U0010ffff"
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+class ProfileStore:
+    # One connection per thread (Streamlit serves sessions from threads);
+    # WAL lets readers proceed while a save is being written.
+    def __init__(self, path, legacy_json=None):
+        self.path = str(path)
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.executescript(_SCHEMA)
+        self.has_fts = self._ensure_fts(conn)
+        if legacy_json:
+            self.migrate_json(legacy_json)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_fts(self, conn):
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'profiles_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            conn.executescript("BEGIN;" + _FTS_SCHEMA + "COMMIT;")
+        except sqlite3.OperationalError:
+            if conn.in_transaction:
+                conn.rollback()
+            return False
+        return True
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def save(self, name, data):
+        row = {k: data[k] for k in PROFILE_FIELDS if k in data}
+        cols = ["name"] + list(row) + ["updated"]
+        vals = [name] + list(row.values()) + [time.time()]
+        sets = ", ".join(c + "=excluded." + c for c in cols[1:])
+        sql = ("INSERT INTO profiles (" + ", ".join(cols) + ") VALUES ("
+               + ", ".join("?" * len(cols)) + ") ON CONFLICT(name) DO UPDATE SET " + sets)
+        conn = self._conn()
+        with conn:
+            conn.execute(sql, vals)
+
+    def get(self, name):
+        cur = self._conn().execute(
+            "SELECT " + ", ".join(PROFILE_FIELDS) + " FROM profiles WHERE name = ?", (name,)
+        )
+        row = cur.fetchone()
+        return None if row is None else dict(row)
+
+    def delete(self, name):
+        conn = self._conn()
+        with conn:
+            return conn.execute("DELETE FROM profiles WHERE name = ?", (name,)).rowcount > 0
+
+    def names(self):
+        return [r[0] for r in self._conn().execute("SELECT name FROM profiles ORDER BY name")]
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def is_empty(self):
+        # LIMIT 1 stops at the first row; COUNT(*) would walk the whole table
+        return self._conn().execute("SELECT 1 FROM profiles LIMIT 1").fetchone() is None
+
+    def __len__(self):
+        return self.count()
+
+    def __bool__(self):
+        return not self.is_empty()
+
+    def __contains__(self, name):
+        return self._conn().execute(
+            "SELECT 1 FROM profiles WHERE name = ?", (name,)
+        ).fetchone() is not None
+
+    def migrate_json(self, json_path):
+        # One-time import of the old kundli_db.json; the file itself is left in place
+        json_path = str(json_path)
+        conn = self._conn()
+        done = conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if done is not None or not os.path.exists(json_path):
+            return 0
+        with open(json_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        now = time.time()
+        rows = []
+        for name, data in legacy.items():
+            if "d" not in data:
+                continue
+            rows.append((
+                name, data["d"], data.get("h", 12), data.get("m", 0), data.get("ampm", "AM"),
+                data.get("lat", 14.98), data.get("lon", 74.73), data.get("p", "Yellapur"), now
+            ))
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO profiles (name, d, h, m, ampm, lat, lon, p, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('json_migrated', ?)", (json_path,)
+            )
+        return len(rows)
+
+    def search(self, query="", mode="prefix", fields=SEARCH_FIELDS, date_from=None,
+               date_to=None, limit=20, after=None):
+        # Keyset paging on name: pass the returned next_after back as `after`
+        # for the following page, so every page is one bounded index walk.
+        if mode not in ("prefix", "substring"):
+            raise ValueError("unknown search mode: " + str(mode))
+        unknown = set(fields) - set(SEARCH_FIELDS)
+        if unknown:
+            raise ValueError("cannot search on: " + ", ".join(sorted(unknown)))
+
+        where = []
+        args = []
+        src = "profiles"
+        q = query.strip()
+        if q and mode == "prefix":
+            ors = []
+            for f in fields:
+                ors.append("(lower(" + f + ") >= ? AND lower(" + f + ") < ?)")
+                args += [q.lower(), _prefix_upper(q.lower())]
+            where.append("(" + " OR ".join(ors) + ")")
+        elif q and self.has_fts and len(q) >= 3:
+            cols = " ".join(fields)
+            src = "profiles JOIN profiles_fts ON profiles_fts.rowid = profiles.rowid"
+            where.append("profiles_fts MATCH ?")
+            args.append("{" + cols + "} : " + _fts_phrase(q))
+        elif q:
+            # Too short for trigrams (or no FTS5): a LIKE scan that stops at the page limit
+            pat = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(" + " OR ".join("profiles." + f + " LIKE ? ESCAPE '\\'" for f in fields) + ")")
+            args += [pat] * len(fields)
+        if date_from is not None:
+            where.append("profiles.d >= ?")
+            args.append(str(date_from))
+        if date_to is not None:
+            where.append("profiles.d <= ?")
+            args.append(str(date_to))
+        if after is not None:
+            where.append("profiles.name > ?")
+            args.append(after)
+
+        sql = "SELECT profiles.name, " + ", ".join("profiles." + f for f in PROFILE_FIELDS)
+        sql += " FROM " + src
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY profiles.name LIMIT ?"
+        args.append(limit + 1)
+
+        rows = [dict(r) for r in self._conn().execute(sql, args)]
+        next_after = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_after = rows[-1]["name"]
+        return ProfilePage(rows, next_after)
@@ -0,0 +1,124 @@
+import datetime
+from typing import NamedTuple
+
+import swisseph as swe
+
+from .chart import IST_OFFSET, _complete, _grahas, _mandi_longitude, calculate_mandi
+from .constants import Planet
+from .ephe import sidereal_mode
+from .lagna import lagna_timetable
+from .lunar import NAK_SPAN, find_angle_crossing
+from .solar import sunrise_sunset
+
+LAGNA_CHANGE = 0
+NAVAMSA_CHANGE = 1
+MANDI_CHANGE = 2
+DASHA_CHANGE = 3
+KN_RECTIFY_KINDS = ["ಲಗ್ನ ಬದಲಾವಣೆ", "ನವಾಂಶ ಲಗ್ನ ಬದಲಾವಣೆ", "ಮಾಂದಿ ರಾಶಿ ಬದಲಾವಣೆ", "ದಶಾ ಬದಲಾವಣೆ"]
+
+class RectifyEvent(NamedTuple):
+    jd: float
+    kind: int
+    # New lagna/navamsa/Mandi rashi, or the Moon's new nakshatra for a
+    # dasha change (its lord is LORDS[index % 9])
+    index: int
+
+class RectificationSweep:
+    # Charts for every moment within +-minutes of a birth time. The grahas are
+    # taken once at the birth time and carried along by their speed (the
+    # Moon, which moves about 15' in half an hour, is recalculated); houses,
+    # Mandi, sphutas and panchanga are redone per moment through the same
+    # code as get_full_calculations, with sunrise and Mandi shared.
+    def __init__(self, jd_birth, lat, lon, ayan_mode=swe.SIDM_LAHIRI, node_mode=swe.TRUE_NODE,
+                 minutes=30.0, tz_offset=IST_OFFSET):
+        self.jd = jd_birth
+        self.lat = lat
+        self.lon = lon
+        self.ayan_mode = ayan_mode
+        self.tz_offset = tz_offset
+        self.start = jd_birth - minutes / 1440.0
+        self.end = jd_birth + minutes / 1440.0
+        self.memo = {}
+        with sidereal_mode(ayan_mode):
+            self.positions, self.speeds = _grahas(jd_birth, node_mode)
+
+    def civil_date(self, jd):
+        y, m, d, _ = swe.revjul(jd + self.tz_offset / 24.0)
+        return datetime.date(y, m, d)
+
+    def _moon(self, jd):
+        res = swe.calc_ut(jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+        return res[0] % 360, res[3]
+
+    def chart_at(self, jd):
+        # Same ChartResult get_full_calculations gives for jd, to within the
+        # slow grahas' motion being taken as linear over the window
+        dt = jd - self.jd
+        positions = [(x + v * dt) % 360 for x, v in zip(self.positions, self.speeds)]
+        speeds = list(self.speeds)
+        with sidereal_mode(self.ayan_mode):
+            positions[Planet.CHANDRA], speeds[Planet.CHANDRA] = self._moon(jd)
+            return _complete(jd, self.lat, self.lon, self.civil_date(jd), positions, speeds, self.memo)
+
+    def _mandi_rashi(self, jd):
+        mandi_time_jd = calculate_mandi(jd, self.lat, self.lon, self.civil_date(jd))[0]
+        key = ("mandi", mandi_time_jd)
+        if key not in self.memo:
+            self.memo[key] = _mandi_longitude(mandi_time_jd, self.lat, self.lon)
+        return int(self.memo[key] // 30)
+
+    def _mandi_events(self):
+        # Mandi's time depends on the birth time only through the day/night
+        # segment it falls in, so its rashi can only change at a sunrise or
+        # sunset; one Mandi per segment settles the whole window
+        day = self.civil_date(self.start)
+        cuts = []
+        for k in (-1, 0, 1, 2):
+            d = day + datetime.timedelta(days=k)
+            cuts.extend(t for t in sunrise_sunset(d.year, d.month, d.day, self.lat, self.lon)
+                        if self.start < t < self.end)
+        cuts.sort()
+        out = []
+        edges = [self.start] + cuts + [self.end]
+        prev = self._mandi_rashi(self.start)
+        for cut, nxt in zip(cuts, edges[2:]):
+            rashi = self._mandi_rashi(0.5 * (cut + nxt))
+            if rashi != prev:
+                out.append(RectifyEvent(cut, MANDI_CHANGE, rashi))
+            prev = rashi
+        return out
+
+    def _dasha_events(self):
+        # The balance of dasha runs continuously with the Moon; its lord
+        # changes when the Moon enters the next nakshatra. Solved on the same
+        # sidereal Moon the chart's nakshatra comes from (moon_angle takes off
+        # the true ayanamsa and can differ by some seconds of time).
+        out = []
+        a = int(self._moon(self.start)[0] // NAK_SPAN)
+        b = int(self._moon(self.end)[0] // NAK_SPAN)
+        while a != b:
+            a = (a + 1) % 27
+            out.append(RectifyEvent(find_angle_crossing(self.start, self._moon, a * NAK_SPAN), DASHA_CHANGE, a))
+        return out
+
+    def events(self):
+        # Every lagna, navamsa lagna, Mandi rashi and dasha change in the
+        # window, in time order
+        out = [RectifyEvent(c.jd, LAGNA_CHANGE if c.division == 1 else NAVAMSA_CHANGE, c.index)
+               for c in lagna_timetable(self.start, self.end, self.lat, self.lon, self.ayan_mode, (1, 9))]
+        with sidereal_mode(self.ayan_mode):
+            out += self._mandi_events()
+            out += self._dasha_events()
+        out.sort()
+        return out
+
+    def segments(self):
+        # (start, end, ChartResult) for each stretch of the window over which
+        # none of the events happen, charted at its middle
+        edges = [self.start] + [e.jd for e in self.events()] + [self.end]
+        return [(a, b, self.chart_at(0.5 * (a + b))) for a, b in zip(edges, edges[1:]) if b > a]
+
+def rectification_sweep(rec, minutes=30.0):
+    # RectificationSweep around a BirthRecord's time
+    return RectificationSweep(rec.jd(), rec.lat, rec.lon, rec.ayan_mode, rec.node_mode,
+                              minutes, rec.tz_offset)
@@ -0,0 +1,282 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import swisseph as swe
+
+from .ashtakavarga import BAV_TARGETS
+from .batch import _init_worker
+from .cache import chart_key
+from .chart import IST_OFFSET, BirthRecord, compute_record
+from .constants import KN_NAK, KN_RASHI, KN_SPHUTAS, KN_TITHI, KN_VARA, KN_YOGA, LORDS, PLANET_ORDER, YEARS
+from .dasha import dasha_at, maha_dashas, sub_periods
+from .errors import ChartError
+from .lru import LRUCache
+from .panchanga import karana_name
+
+AYANAMSAS = {"lahiri": swe.SIDM_LAHIRI, "raman": swe.SIDM_RAMAN, "kp": swe.SIDM_KRISHNAMURTI}
+NODES = {"true": swe.TRUE_NODE, "mean": swe.MEAN_NODE}
+
+_MISSING = object()
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 422: "Unprocessable Entity",
+            431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+# Largest request body read; a birth record is well under 1 KiB
+MAX_BODY = 64 * 1024
+
+# ------------------------------------------------------------------
+# Requests -> BirthRecord
+# ------------------------------------------------------------------
+def parse_record(params):
+    # date=YYYY-MM-DD, time=HH:MM (24 h, local), lat, lon, and optionally
+    # tz (hours east of UT), ayanamsa (lahiri/raman/kp), node (true/mean).
+    # Raises ValueError for anything missing or malformed.
+    try:
+        dob = datetime.date.fromisoformat(params["date"])
+        hour, minute = (int(x) for x in params["time"].split(":"))
+        lat, lon = float(params["lat"]), float(params["lon"])
+        tz = float(params.get("tz", IST_OFFSET))
+    except KeyError as e:
+        raise ValueError(f"missing parameter {e.args[0]}") from None
+    ayan = params.get("ayanamsa", "lahiri")
+    node = params.get("node", "true")
+    if ayan not in AYANAMSAS:
+        raise ValueError(f"ayanamsa must be one of {', '.join(AYANAMSAS)}")
+    if node not in NODES:
+        raise ValueError(f"node must be one of {', '.join(NODES)}")
+    if not (0 <= hour < 24 and 0 <= minute < 60 and -90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("time or place out of range")
+    return BirthRecord(dob, hour, minute, lat, lon, AYANAMSAS[ayan], NODES[node], tz)
+
+# ------------------------------------------------------------------
+# ChartResult -> JSON-ready dicts, one per endpoint
+# ------------------------------------------------------------------
+def chart_json(res, params):
+    nak, pada = res.nak.tolist(), res.pada.tolist()
+    planets = []
+    for i, name in enumerate(PLANET_ORDER):
+        deg = float(res.lon[i])
+        planets.append({
+            "name": name, "longitude": deg, "speed": float(res.speed[i]),
+            "rashi": int(deg // 30), "nakshatra": nak[i], "pada": pada[i],
+        })
+    return {
+        "jd": res.jd, "planets": planets, "bhavas": res.bhavas,
+        "sphutas": dict(zip(KN_SPHUTAS, res.sphutas.tolist())),
+    }
+
+def panchanga_json(res, params):
+    t_idx, w_idx, n_idx, y_idx, k_idx, r_idx = res.panchanga.tolist()
+    return {
+        "tithi": {"index": t_idx, "name": KN_TITHI[t_idx]},
+        "vara": {"index": w_idx, "name": KN_VARA[w_idx]},
+        "nakshatra": {"index": n_idx, "name": KN_NAK[n_idx % 27],
+                      "start": res.nak_start, "end": res.nak_end, "elapsed": res.perc},
+        "yoga": {"index": y_idx, "name": KN_YOGA[y_idx]},
+        "karana": {"index": k_idx, "name": karana_name(k_idx)},
+        "rashi": {"index": r_idx, "name": KN_RASHI[r_idx]},
+        "sunrise": res.sunrise,
+    }
+
+def _period_json(p):
+    return {"lords": [LORDS[l] for l in p.lords], "start": p.start.isoformat(),
+            "end": p.end.isoformat(), "years": p.years}
+
+def dasha_json(res, params):
+    # Same seed as the Dasha tab. `when` (ISO date-time, default now) picks
+    # the running periods, `depth` (1-5, default 3) how far down they go.
+    pan = res.pan
+    seed = (pan["date_obj"], pan["n_idx"], pan["perc"])
+    when = datetime.datetime.fromisoformat(params["when"]) if "when" in params else datetime.datetime.now()
+    depth = min(max(int(params.get("depth", 3)), 1), 5)
+    mahas = list(maha_dashas(*seed))
+    return {
+        "balance": {"lord": pan["lord_bal"], "years": YEARS[pan["n_idx"] % 9] * (1 - pan["perc"])},
+        "running": [_period_json(p) for p in dasha_at(*seed, when, depth=depth)],
+        "mahadashas": [dict(_period_json(p), antardashas=[_period_json(a) for a in sub_periods(p)])
+                       for p in mahas],
+    }
+
+def ashtakavarga_json(res, params):
+    return {"sav": res.sav.tolist(), "bav": dict(zip(BAV_TARGETS, res.bav.tolist()))}
+
+ENDPOINTS = {
+    "/chart": chart_json,
+    "/panchanga": panchanga_json,
+    "/dasha": dasha_json,
+    "/ashtakavarga": ashtakavarga_json,
+}
+
+# ------------------------------------------------------------------
+# Chart service: result cache plus coalescing of identical in-flight charts
+# ------------------------------------------------------------------
+class ChartService:
+    def __init__(self, workers=None, cache_size=4096, ttl=6 * 3600.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        # The first submit forks the whole pool. Doing it here, before any
+        # socket is open, keeps workers from inheriting client connections
+        # (which would then stay open after the server closes them).
+        self.executor.submit(_init_worker)
+        self.cache = LRUCache(maxsize=cache_size, ttl=ttl)
+        self.inflight = {}
+        self.computed = 0
+        self.coalesced = 0
+
+    async def chart(self, rec):
+        key = chart_key(rec.jd(), rec.lat, rec.lon, rec.dob, rec.ayan_mode, rec.node_mode)
+        res = self.cache.get(key, _MISSING)
+        if res is not _MISSING:
+            return res
+        fut = self.inflight.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().run_in_executor(self.executor, compute_record, rec)
+            self.inflight[key] = fut
+            self.computed += 1
+            fut.add_done_callback(lambda f: self._done(key, f))
+        else:
+            self.coalesced += 1
+        # A client that disconnects must not cancel a chart others wait on
+        return await asyncio.shield(fut)
+
+    def _done(self, key, fut):
+        del self.inflight[key]
+        if not fut.cancelled() and fut.exception() is None:
+            self.cache.put(key, fut.result())
+
+    def stats(self):
+        return dict(self.cache.stats()._asdict(), workers=self.workers, computed=self.computed,
+                    coalesced=self.coalesced, inflight=len(self.inflight))
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+# ------------------------------------------------------------------
+# Minimal HTTP/1.1 over asyncio streams (GET with a query string, or POST
+# with a JSON object body), keep-alive by default
+# ------------------------------------------------------------------
+class _RequestError(Exception):
+    # A request that cannot be read; answered with this status, then the
+    # connection is closed since the stream position is no longer known
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+async def _read_request(reader):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise _RequestError(431, "request head too large") from None
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    if len(parts) != 3:
+        raise _RequestError(400, "malformed request line")
+    method, target, version = parts
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    if "transfer-encoding" in headers:
+        raise _RequestError(400, "chunked bodies are not supported; send Content-Length")
+    body = b""
+    if "content-length" in headers:
+        length = headers["content-length"]
+        if not length.isdigit():
+            raise _RequestError(400, "invalid Content-Length")
+        if int(length) > MAX_BODY:
+            raise _RequestError(413, f"body larger than {MAX_BODY} bytes")
+        body = await reader.readexactly(int(length))
+    return method, target, version, headers, body
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+async def _dispatch(service, method, target, body):
+    url = urlsplit(target)
+    if url.path == "/stats":
+        return 200, service.stats()
+    render = ENDPOINTS.get(url.path)
+    if render is None:
+        return 404, {"error": f"unknown endpoint {url.path}"}
+    if method == "GET":
+        params = dict(parse_qsl(url.query))
+    elif method == "POST":
+        try:
+            params = {k: str(v) for k, v in json.loads(body or b"{}").items()}
+        except (ValueError, AttributeError):
+            return 400, {"error": "body must be a JSON object"}
+    else:
+        return 405, {"error": "use GET or POST"}
+    try:
+        rec = parse_record(params)
+        return 200, render(await service.chart(rec), params)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    except ChartError as e:
+        return 422, {"error": str(e)}
+
+async def _handle(service, reader, writer):
+    try:
+        while True:
+            try:
+                method, target, version, headers, body = await _read_request(reader)
+            except asyncio.IncompleteReadError:
+                break
+            except _RequestError as e:
+                writer.write(_response(e.status, {"error": str(e)}, False))
+                await writer.drain()
+                break
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            try:
+                status, payload = await _dispatch(service, method, target, body)
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(host="127.0.0.1", port=8080, workers=None, cache_size=4096):
+    # Runs until SIGINT/SIGTERM, then shuts the worker pool down with it so
+    # no chart processes outlive the server
+    service = ChartService(workers, cache_size)
+    server = await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bharatheeyam JSON API")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--workers", type=int, default=None, help="chart processes (default: CPU count)")
+    ap.add_argument("--cache-size", type=int, default=4096)
+    args = ap.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.workers, args.cache_size))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import json
+import math
+import os
+
+import swisseph as swe
+
+from .lru import LRUCache
+
+# Using -0.583 for Mid-Limb Sunrise (center of sun including refraction)
+SUNRISE_ALT = -0.583
+SIDEREAL_RATE = 360.98564736629 # deg of hour angle per day, before the Sun's own RA drift
+# Within this of |cos H0| = 1 the Sun nearly grazes the horizon and sunrise
+# falls back to the hourly scan
+_POLAR_MARGIN = 0.02
+
+def get_altitude_manual(jd, lat, lon):
+    res = swe.calc_ut(jd, swe.SUN, swe.FLG_EQUATORIAL | swe.FLG_SWIEPH)
+    ra = res[0][0]
+    dec = res[0][1]
+    gmst = swe.sidtime(jd)
+    lst = gmst + (lon / 15.0)
+    ha_deg = ((lst * 15.0) - ra + 360) % 360
+    if ha_deg > 180: 
+        ha_deg -= 360
+        
+    lat_rad = math.radians(lat)
+    dec_rad = math.radians(dec)
+    ha_rad = math.radians(ha_deg)
+    
+    p1 = math.sin(lat_rad) * math.sin(dec_rad)
+    p2 = math.cos(lat_rad) * math.cos(dec_rad) * math.cos(ha_rad)
+    sin_alt = p1 + p2
+    
+    return math.degrees(math.asin(sin_alt))
+
+def _altitude_and_rate(jd, lat, lon):
+    res = swe.calc_ut(jd, swe.SUN, swe.FLG_EQUATORIAL | swe.FLG_SWIEPH | swe.FLG_SPEED)
+    ra, dec, _, ra_speed, dec_speed, _ = res[0]
+    ha = math.radians((swe.sidtime(jd) + lon / 15.0) * 15.0 - ra)
+    lat_rad = math.radians(lat)
+    dec_rad = math.radians(dec)
+
+    sin_alt = math.sin(lat_rad) * math.sin(dec_rad) + math.cos(lat_rad) * math.cos(dec_rad) * math.cos(ha)
+    alt = math.asin(sin_alt)
+    d_dec = math.radians(dec_speed)
+    d_ha = math.radians(SIDEREAL_RATE - ra_speed)
+    d_sin = (math.sin(lat_rad) * math.cos(dec_rad) * d_dec
+             - math.cos(lat_rad) * math.sin(dec_rad) * math.cos(ha) * d_dec
+             - math.cos(lat_rad) * math.cos(dec_rad) * math.sin(ha) * d_ha)
+    return math.degrees(alt), math.degrees(d_sin / math.cos(alt))
+
+def _refine_crossing(jd, lat, lon, max_iter=6, tol=1e-7):
+    # Newton on the altitude; returns (jd, converged)
+    for _ in range(max_iter):
+        alt, rate = _altitude_and_rate(jd, lat, lon)
+        if rate == 0:
+            return jd, False
+        dt = (SUNRISE_ALT - alt) / rate
+        dt = max(-0.1, min(0.1, dt))
+        jd += dt
+        if abs(dt) < tol:
+            return jd, True
+    return jd, False
+
+def _cos_h0(jd, lat):
+    # Cosine of the Sun's hour angle at rising for its declination at jd
+    # (beyond +-1 it does not rise or set), and its right ascension
+    res = swe.calc_ut(jd, swe.SUN, swe.FLG_EQUATORIAL | swe.FLG_SWIEPH)
+    ra, dec = res[0][0], res[0][1]
+    lat_rad = math.radians(lat)
+    dec_rad = math.radians(dec)
+    cos_h0 = ((math.sin(math.radians(SUNRISE_ALT)) - math.sin(lat_rad) * math.sin(dec_rad))
+              / (math.cos(lat_rad) * math.cos(dec_rad)))
+    return cos_h0, ra
+
+def find_sunrise_set_for_date(year, month, day, lat, lon, method="newton"):
+    if method == "scan":
+        return _find_sunrise_set_scan(year, month, day, lat, lon)
+    if method != "newton":
+        raise ValueError("unknown sunrise method: " + str(method))
+
+    jd_start = swe.julday(year, month, day, 0.0) 
+    rise_time, set_time = jd_start + 0.25, jd_start + 0.75 # Safe defaults
+    # Same window the hourly scan covers; when it holds two events the later one wins there too
+    w_lo, w_hi = jd_start - 0.3, jd_start - 0.3 + 30 / 24.0
+
+    # The declination, and with it cos H0, moves monotonically across the
+    # window, so its two ends bound it. Only when the Sun stays clear of
+    # the horizon throughout is there certainly no crossing; when it comes
+    # near grazing anywhere the closed-form guesses are unreliable and the
+    # hourly scan decides.
+    ends = [abs(_cos_h0(jd, lat)[0]) for jd in (w_lo, w_hi)]
+    if min(ends) >= 1 + _POLAR_MARGIN:
+        return rise_time, set_time
+    if max(ends) > 1 - _POLAR_MARGIN:
+        return _find_sunrise_set_scan(year, month, day, lat, lon)
+
+    # Closed-form estimate from the Sun's RA/Dec at the window's middle, refined by Newton steps
+    jd_mid = (w_lo + w_hi) / 2
+    cos_h0, ra = _cos_h0(jd_mid, lat)
+    h0 = math.degrees(math.acos(cos_h0))
+    ha_mid = (swe.sidtime(jd_mid) + lon / 15.0) * 15.0 - ra
+    transit = jd_mid - (((ha_mid + 180) % 360) - 180) / SIDEREAL_RATE
+
+    rises, sets = [], []
+    for k in (-1, 0, 1):
+        t_k = transit + k
+        for guess, found in ((t_k - h0 / SIDEREAL_RATE, rises), (t_k + h0 / SIDEREAL_RATE, sets)):
+            if guess < w_lo - 0.05 or guess > w_hi + 0.05:
+                continue
+            jd, converged = _refine_crossing(guess, lat, lon)
+            if not converged:
+                return _find_sunrise_set_scan(year, month, day, lat, lon)
+            if w_lo < jd <= w_hi:
+                found.append(jd)
+
+    if rises:
+        rise_time = max(rises)
+    if sets:
+        set_time = max(sets)
+    return rise_time, set_time
+
+def _find_sunrise_set_scan(year, month, day, lat, lon):
+    jd_start = swe.julday(year, month, day, 0.0) 
+    rise_time, set_time = jd_start + 0.25, jd_start + 0.75 # Safe defaults
+    step = 1/24.0
+    current = jd_start - 0.3 
+    
+    for i in range(30): 
+        alt1 = get_altitude_manual(current, lat, lon)
+        alt2 = get_altitude_manual(current + step, lat, lon)
+        if alt1 < SUNRISE_ALT and alt2 >= SUNRISE_ALT:
+            l, h = current, current + step
+            for _ in range(20): 
+                m = (l + h) / 2
+                if get_altitude_manual(m, lat, lon) < SUNRISE_ALT: 
+                    l = m
+                else: 
+                    h = m
+            rise_time = h
+        if alt1 > SUNRISE_ALT and alt2 <= SUNRISE_ALT:
+            l, h = current, current + step
+            for _ in range(20): 
+                m = (l + h) / 2
+                if get_altitude_manual(m, lat, lon) > SUNRISE_ALT: 
+                    l = m
+                else: 
+                    h = m
+            set_time = h
+        current += step
+        
+    return rise_time, set_time
+
+# Daily solar events shared by Mandi, panchanga and calendar code. Places are
+# rounded to 0.001 deg (~100 m, well under a second of sunrise) so births
+# entered for the same town land on one entry.
+SOLAR_PRECISION = 3
+solar_cache = LRUCache(maxsize=8192)
+
+def solar_key(year, month, day, lat, lon, precision=SOLAR_PRECISION):
+    return (year, month, day, round(float(lat), precision), round(float(lon), precision))
+
+def sunrise_sunset(year, month, day, lat, lon, cache=None):
+    cache = solar_cache if cache is None else cache
+    key = solar_key(year, month, day, lat, lon)
+    res = cache.get(key)
+    if res is None:
+        res = find_sunrise_set_for_date(year, month, day, key[3], key[4])
+        cache.put(key, res)
+    return res
+
+def save_solar_cache(path, cache=None):
+    cache = solar_cache if cache is None else cache
+    rows = [list(k) + list(v) for k, v in cache.items()]
+    tmp = str(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(rows, f)
+    os.replace(tmp, path)
+
+def load_solar_cache(path, cache=None):
+    cache = solar_cache if cache is None else cache
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        rows = json.load(f)
+    for y, m, d, lat, lon, rise, sset in rows:
+        cache.put((y, m, d, lat, lon), (rise, sset))
+    return len(rows)
@@ -0,0 +1,260 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+import swisseph as swe
+
+from .batch import _init_worker
+from .constants import Planet
+from .ephe import sidereal_mode
+from .lunar import NAK_SPAN
+
+RASHI_INGRESS = 0
+NAK_INGRESS = 1
+STATION_RETRO = 2
+STATION_DIRECT = 3
+KN_TRANSIT_KINDS = ["ರಾಶಿ ಪ್ರವೇಶ", "ನಕ್ಷತ್ರ ಪ್ರವೇಶ", "ವಕ್ರ ಆರಂಭ", "ಮಾರ್ಗಿ ಆರಂಭ"]
+
+# (kind, span in degrees, number of divisions)
+_GRIDS = ((RASHI_INGRESS, 30.0, 12), (NAK_INGRESS, NAK_SPAN, 27))
+
+# Longest step per body in days. Bodies that station must not step over a
+# whole retrograde loop (Mercury's is about three weeks).
+_MAX_STEP = {
+    swe.SUN: 8.0, swe.MOON: 1.5, swe.MERCURY: 6.0, swe.VENUS: 8.0, swe.MARS: 8.0,
+    swe.JUPITER: 8.0, swe.SATURN: 8.0, swe.MEAN_NODE: 30.0, swe.TRUE_NODE: 2.0,
+}
+# The true node wobbles, with short direct spells that can be hours apart;
+# steps that come near a boundary are re-scanned at this resolution instead
+# of being split at every station
+_FINE_STEP = {swe.TRUE_NODE: 0.25}
+# A step never moves a body more than this many degrees
+_STEP_DEG = 12.0
+_STATION_BODIES = (swe.MERCURY, swe.VENUS, swe.MARS, swe.JUPITER, swe.SATURN)
+
+class TransitEvent(NamedTuple):
+    jd: float
+    planet: int
+    kind: int
+    # New rashi/nakshatra index for ingresses, occupied rashi for stations
+    index: int
+    retrograde: bool
+
+def _bodies(node_mode):
+    # swisseph body -> [(Planet slot, longitude offset)]
+    return [
+        (swe.SUN, [(Planet.RAVI, 0.0)]), (swe.MOON, [(Planet.CHANDRA, 0.0)]),
+        (swe.MERCURY, [(Planet.BUDHA, 0.0)]), (swe.VENUS, [(Planet.SHUKRA, 0.0)]),
+        (swe.MARS, [(Planet.KUJA, 0.0)]), (swe.JUPITER, [(Planet.GURU, 0.0)]),
+        (swe.SATURN, [(Planet.SHANI, 0.0)]),
+        (node_mode, [(Planet.RAHU, 0.0), (Planet.KETU, 180.0)]),
+    ]
+
+def _wrap(x):
+    return (x + 180) % 360 - 180
+
+class _Body:
+    def __init__(self, body):
+        self.body = body
+        self.flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+        self.calls = 0
+
+    def __call__(self, jd):
+        self.calls += 1
+        res = swe.calc_ut(jd, self.body, self.flag)[0]
+        return res[0], res[3]
+
+def _station(calc, ta, va, tb, vb, tol=1e-5):
+    # Illinois regula falsi on the speed, which changes sign in [ta, tb]
+    side = 0
+    while tb - ta > tol:
+        t = (ta * vb - tb * va) / (vb - va)
+        if not ta < t < tb:
+            t = 0.5 * (ta + tb)
+        v = calc(t)[1]
+        if (v > 0) == (va > 0):
+            ta, va = t, v
+            if side == -1:
+                vb *= 0.5
+            side = -1
+        else:
+            tb, vb = t, v
+            if side == 1:
+                va *= 0.5
+            side = 1
+    return 0.5 * (ta + tb)
+
+def _hermite_guess(target, ta, xa, va, tb, xb, vb):
+    # Solve the cubic through both ends (value and speed) for the target;
+    # no ephemeris calls, and close enough that one live Newton step finishes
+    h = tb - ta
+    dx = xb - xa
+    s = (target - xa) / dx
+    for _ in range(4):
+        s2, s3 = s * s, s * s * s
+        x = xa + (s3 - 2 * s2 + s) * h * va + (-2 * s3 + 3 * s2) * dx + (s3 - s2) * h * vb
+        dxds = (3 * s2 - 4 * s + 1) * h * va + (6 * s - 6 * s2) * dx + (3 * s2 - 2 * s) * h * vb
+        if dxds == 0:
+            break
+        s = min(max(s - (x - target) / dxds, 0.0), 1.0)
+    return ta + s * h
+
+def _crossing(calc, offset, target, ta, xa, va, tb, xb, vb, tol=1e-7):
+    # Safeguarded Newton inside a monotonic piece [ta, tb] whose unwrapped
+    # longitude runs from xa to xb through `target`. Once the next Newton
+    # step is small enough that its quadratic error (curvature taken from the
+    # end speeds) is below tol, it is taken without another call.
+    forward = xb > xa
+    curve = abs(vb - va) / (tb - ta)
+    t = _hermite_guess(target, ta, xa, va, tb, xb, vb)
+    lo, hi = ta, tb
+    for _ in range(40):
+        x, v = calc(t)
+        diff = _wrap(x + offset - target)
+        if (diff < 0) == forward:
+            lo = t
+        else:
+            hi = t
+        step = diff / v if v and (v > 0) == forward else math.inf
+        nt = t - step
+        if not lo < nt < hi:
+            nt = 0.5 * (lo + hi)
+        elif curve * step * step < 2 * abs(v) * tol:
+            return nt
+        if abs(nt - t) < tol or hi - lo < tol:
+            return nt
+        t = nt
+    return t
+
+def _piece_events(calc, slots, ta, xa, va, tb, xb, vb, out):
+    d = _wrap(xb - xa)
+    retro = d < 0
+    for planet, offset in slots:
+        a = (xa + offset) % 360
+        b = a + d
+        for kind, span, count in _GRIDS:
+            ia, ib = math.floor(a / span), math.floor(b / span)
+            if ia == ib:
+                continue
+            if d > 0:
+                ks = range(ia + 1, ib + 1)
+            else:
+                ks = range(ia, ib, -1)
+            for k in ks:
+                jd = _crossing(calc, offset, k * span, ta, a, va, tb, b, vb)
+                new = (k if d > 0 else k - 1) % count
+                out.append(TransitEvent(jd, int(planet), kind, new, retro))
+
+def _near_boundary(slots, x0, x1, reach):
+    d = _wrap(x1 - x0)
+    for _, offset in slots:
+        a = (x0 + offset) % 360
+        lo, hi = min(a, a + d) - reach, max(a, a + d) + reach
+        for _, span, _ in _GRIDS:
+            if math.floor(lo / span) != math.floor(hi / span):
+                return True
+    return False
+
+def _split_at_station(calc, slots, t0, x0, v0, t1, x1, v1, out):
+    ts = _station(calc, t0, v0, t1, v1)
+    xs = calc(ts)[0]
+    _piece_events(calc, slots, t0, x0, v0, ts, xs, 0.0, out)
+    _piece_events(calc, slots, ts, xs, 0.0, t1, x1, v1, out)
+    return ts, xs
+
+def _scan_span(calc, slots, t0, x0, v0, end, max_step, fine_step, stations, out):
+    while end - t0 > 1e-9:
+        h = min(max(_STEP_DEG / max(abs(v0), 1e-9), 0.05), max_step, end - t0)
+        t1 = t0 + h
+        x1, v1 = calc(t1)
+        turned = (v0 > 0) != (v1 > 0)
+        if turned and stations:
+            ts, xs = _split_at_station(calc, slots, t0, x0, v0, t1, x1, v1, out)
+            kind = STATION_RETRO if v1 < 0 else STATION_DIRECT
+            out.append(TransitEvent(ts, int(slots[0][0]), kind, int(xs // 30) % 12, v1 < 0))
+        elif not _near_boundary(slots, x0, x1, 1.5 * h * max(abs(v0), abs(v1))):
+            pass
+        elif fine_step and h > fine_step:
+            _scan_span(calc, slots, t0, x0, v0, t1, fine_step, None, False, out)
+        elif turned:
+            _split_at_station(calc, slots, t0, x0, v0, t1, x1, v1, out)
+        else:
+            _piece_events(calc, slots, t0, x0, v0, t1, x1, v1, out)
+        t0, x0, v0 = t1, x1, v1
+
+def _scan_body(body, slots, start, end, out):
+    calc = _Body(body)
+    x0, v0 = calc(start)
+    _scan_span(calc, slots, start, x0, v0, end, _MAX_STEP.get(body, 4.0),
+               _FINE_STEP.get(body), body in _STATION_BODIES, out)
+    return calc.calls
+
+class TransitTable:
+    # Events sorted by time in parallel arrays, so range and per-planet
+    # queries are a mask or a searchsorted away
+    def __init__(self, events):
+        events = sorted(events)
+        self.jd = np.array([e.jd for e in events], dtype=np.float64)
+        self.planet = np.array([e.planet for e in events], dtype=np.int8)
+        self.kind = np.array([e.kind for e in events], dtype=np.int8)
+        self.index = np.array([e.index for e in events], dtype=np.int16)
+        self.retrograde = np.array([e.retrograde for e in events], dtype=bool)
+
+    def __len__(self):
+        return self.jd.shape[0]
+
+    def __getitem__(self, i):
+        return TransitEvent(float(self.jd[i]), int(self.planet[i]), int(self.kind[i]),
+                            int(self.index[i]), bool(self.retrograde[i]))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def select(self, planet=None, kind=None, start=None, end=None):
+        lo = 0 if start is None else np.searchsorted(self.jd, start, side="left")
+        hi = len(self) if end is None else np.searchsorted(self.jd, end, side="right")
+        idx = np.arange(lo, hi)
+        if planet is not None:
+            idx = idx[self.planet[lo:hi] == planet]
+        if kind is not None:
+            idx = idx[self.kind[idx] == kind]
+        return [self[i] for i in idx]
+
+    def last_before(self, planet, kind, jd):
+        # Most recent event of this kind at or before jd, or None
+        idx = np.nonzero((self.planet == planet) & (self.kind == kind) & (self.jd <= jd))[0]
+        return self[idx[-1]] if idx.size else None
+
+def _scan_task(task):
+    body, slots, start, end, ayan_mode = task
+    out = []
+    with sidereal_mode(ayan_mode):
+        _scan_body(body, slots, start, end, out)
+    return [e for e in out if start <= e.jd < end]
+
+def scan_transits(start_jd, end_jd, ayan_mode=swe.SIDM_LAHIRI, node_mode=swe.TRUE_NODE,
+                  planets=None, workers=1, chunk_days=3652.5):
+    # Every rashi and nakshatra ingress of the nine grahas in [start_jd, end_jd),
+    # plus the retrograde and direct stations of the five tara grahas. With
+    # workers > 1 each body's range is cut into chunk_days pieces that are
+    # scanned in a process pool.
+    tasks = []
+    for body, slots in _bodies(node_mode):
+        if planets is not None:
+            slots = [s for s in slots if s[0] in planets]
+            if not slots:
+                continue
+        if workers == 1:
+            tasks.append((body, slots, start_jd, end_jd, ayan_mode))
+            continue
+        t = start_jd
+        while t < end_jd:
+            tasks.append((body, slots, t, min(t + chunk_days, end_jd), ayan_mode))
+            t += chunk_days
+    if workers == 1:
+        results = map(_scan_task, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+            results = list(ex.map(_scan_task, tasks))
+    return TransitTable(e for chunk in results for e in chunk)
@@ -0,0 +1,76 @@
+import numpy as np
+
+SHODASHAVARGA = (1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60)
+
+# Trimshamsha: (upper bound of the part in degrees, rashi) for odd and even signs
+_D30_BOUNDS = np.array([5, 10, 18, 25, 30], dtype=float)
+_D30_ODD = np.array([0, 10, 8, 2, 6])
+_D30_EVEN_BOUNDS = np.array([5, 12, 20, 25, 30], dtype=float)
+_D30_EVEN = np.array([5, 2, 8, 10, 0])
+
+# Start rashi by sign modality (movable, fixed, dual)
+_D16_START = np.array([0, 4, 8])
+_D20_START = np.array([0, 8, 4])
+_D45_START = np.array([0, 4, 8])
+
+def _split(longitudes):
+    d = np.asarray(longitudes, dtype=float) % 360
+    r = (d // 30).astype(np.int64)
+    return d, r, d % 30
+
+def varga_indices(longitudes, division):
+    # Rashi index (0 = Mesha) of each longitude in the given divisional chart
+    d, r, dr = _split(longitudes)
+    odd = (r % 2 == 0)
+    if division == 1:
+        out = r
+    elif division == 2:
+        first = dr < 15
+        out = np.where(odd == first, 4, 3)
+    elif division == 3:
+        out = r + (dr // 10).astype(np.int64) * 4
+    elif division == 4:
+        out = r + (dr // 7.5).astype(np.int64) * 3
+    elif division == 7:
+        out = r + np.where(odd, 0, 6) + (dr * 7 // 30).astype(np.int64)
+    elif division == 9:
+        out = (d * 9 // 30).astype(np.int64)
+    elif division == 10:
+        out = r + np.where(odd, 0, 8) + (dr // 3).astype(np.int64)
+    elif division == 12:
+        out = r + (dr // 2.5).astype(np.int64)
+    elif division == 16:
+        out = _D16_START[r % 3] + (dr * 16 // 30).astype(np.int64)
+    elif division == 20:
+        out = _D20_START[r % 3] + (dr * 20 // 30).astype(np.int64)
+    elif division == 24:
+        out = np.where(odd, 4, 3) + (dr * 24 // 30).astype(np.int64)
+    elif division == 27:
+        out = (d * 27 // 30).astype(np.int64)
+    elif division == 30:
+        odd_part = np.minimum(np.searchsorted(_D30_BOUNDS, dr, side="right"), 4)
+        even_part = np.minimum(np.searchsorted(_D30_EVEN_BOUNDS, dr, side="right"), 4)
+        out = np.where(odd, _D30_ODD[odd_part], _D30_EVEN[even_part])
+    elif division == 40:
+        out = np.where(odd, 0, 6) + (dr * 40 // 30).astype(np.int64)
+    elif division == 45:
+        out = _D45_START[r % 3] + (dr * 45 // 30).astype(np.int64)
+    elif division == 60:
+        out = r + (dr * 2).astype(np.int64)
+    else:
+        raise ValueError("unsupported varga: D" + str(division))
+    return np.asarray(out % 12, dtype=np.int64)
+
+def shodashavarga(longitudes, divisions=SHODASHAVARGA):
+    # Stacks the requested vargas on a new last axis: (..., len(divisions))
+    return np.stack([varga_indices(longitudes, n) for n in divisions], axis=-1)
+
+def varga_longitude(longitudes, division):
+    # Position inside the varga sign, for sub-divisions such as the drekkana part
+    return (np.asarray(longitudes, dtype=float) * division) % 30
+
+def bhava_indices(longitudes, lagna):
+    # Equal houses with the lagna at the middle of the first bhava
+    d = np.asarray(longitudes, dtype=float)
+    lagna = np.asarray(lagna, dtype=float)
+    return ((lagna // 30).astype(np.int64) + (((d - lagna + 360) % 360 + 15) // 30).astype(np.int64)) % 12
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import swisseph as swe
+
+from bharatheeyam import ERROR_BOUND_ARCSEC, EphemerisTable, build_ephemeris_table, sidereal_mode
+
+
+def live_longitudes(jds, bodies, ayan_mode):
+    flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+    lon = np.empty((len(jds), len(bodies)))
+    with sidereal_mode(ayan_mode):
+        for i, jd in enumerate(jds):
+            for j, body in enumerate(bodies):
+                lon[i, j] = swe.calc_ut(jd, body, flag)[0][0]
+    return lon
+
+
+def test_table_within_error_bound(tmp_path):
+    table = build_ephemeris_table(1995, 1998)
+    table.save(tmp_path / "ephe")
+    table = EphemerisTable.load(tmp_path / "ephe")
+
+    rng = np.random.default_rng(7)
+    jds = rng.uniform(table.start_jd, table.end_jd, 3000)
+    lon, _ = table.positions(jds)
+    live = live_longitudes(jds, table.bodies, table.ayan_mode)
+
+    err = np.abs((lon - live + 180) % 360 - 180).max(axis=0) * 3600
+    for body, e in zip(table.bodies, err):
+        assert e <= ERROR_BOUND_ARCSEC, f"{swe.get_planet_name(body)}: {e:.3f}\""
+
+
+def test_grid_points_are_exact():
+    table = build_ephemeris_table(2000, 2000)
+    jds = table.start_jd + np.arange(0, 360, 37) * table.step
+    lon, _ = table.positions(jds)
+    live = live_longitudes(jds, table.bodies, table.ayan_mode)
+    assert np.abs((lon - live + 180) % 360 - 180).max() < 1e-9